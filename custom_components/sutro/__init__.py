@@ -2,93 +2,45 @@
 
 For more details about this integration, please refer to
 https://github.com/ydogandjiev/hass-sutro
+
+The package itself does not import Home Assistant, so that the API client and
+the ``python -m custom_components.sutro`` command line work without it. The
+entry points below import the Home Assistant side of the integration from
+``integration`` the first time they are called.
 """
 from __future__ import annotations
 
-import asyncio
-import logging
-from datetime import timedelta
+import importlib
+import sys
+from types import ModuleType
+from typing import TYPE_CHECKING
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_TOKEN
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from homeassistant.helpers.update_coordinator import UpdateFailed
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
 
-from .api import SutroDataApiClient
-from .const import DOMAIN
-from .const import PLATFORMS
-from .const import STARTUP_MESSAGE
+_INTEGRATION = f"{__name__}.integration"
 
-SCAN_INTERVAL = timedelta(minutes=30)
 
-_LOGGER: logging.Logger = logging.getLogger(__package__)
+async def _async_get_integration(hass: HomeAssistant) -> ModuleType:
+    """Return the Home Assistant side of the integration, imported off the loop."""
+    if (module := sys.modules.get(_INTEGRATION)) is None:
+        module = await hass.async_add_import_executor_job(
+            importlib.import_module, _INTEGRATION
+        )
+    return module
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up this integration using UI."""
-    if hass.data.get(DOMAIN) is None:
-        hass.data.setdefault(DOMAIN, {})
-        _LOGGER.info(STARTUP_MESSAGE)
-
-    token: str | None = entry.data.get(CONF_TOKEN)
-
-    if token:
-        session = async_get_clientsession(hass)
-        client = SutroDataApiClient(token, session)
-
-        coordinator = SutroDataUpdateCoordinator(hass, client)
-        await coordinator.async_refresh()
-
-        if not coordinator.last_update_success:
-            raise ConfigEntryNotReady
-
-        hass.data[DOMAIN][entry.entry_id] = coordinator
-
-        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-
-        entry.add_update_listener(async_reload_entry)
-
-    return True
-
-
-class SutroDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the API."""
-
-    def __init__(
-        self,
-        hass: HomeAssistant,
-        client: SutroDataApiClient,
-    ) -> None:
-        """Initialize."""
-        self.api = client
-
-        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=SCAN_INTERVAL)
-
-    async def _async_update_data(self):
-        """Update data via library."""
-        try:
-            return await self.api.async_get_data()
-        except Exception as exception:
-            raise UpdateFailed() from exception
+    return await (await _async_get_integration(hass)).async_setup_entry(hass, entry)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle removal of an entry."""
-    unloaded = all(
-        await asyncio.gather(
-            *[hass.config_entries.async_unload_platforms(entry, PLATFORMS)]
-        )
-    )
-    if unloaded:
-        hass.data[DOMAIN].pop(entry.entry_id)
-
-    return unloaded
+    return await (await _async_get_integration(hass)).async_unload_entry(hass, entry)
 
 
-async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Discard what is stored for a removed entry."""
+    await (await _async_get_integration(hass)).async_remove_entry(hass, entry)
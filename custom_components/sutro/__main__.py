@@ -0,0 +1,232 @@
+"""Check Sutro accounts from the command line, without Home Assistant.
+
+Reads one account per line from a file, or from stdin with ``-``: either a
+token, or a JSON object with a ``token`` or an ``email`` and ``password``,
+and an optional ``name``. Blank lines and lines starting with ``#`` are
+skipped. The accounts are polled concurrently, at most ``--concurrency`` at a
+time, and one JSON line is printed for each as soon as it is done::
+
+    python -m custom_components.sutro accounts.txt --concurrency 20
+
+Exits with 1 when any account could not be polled.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from collections.abc import Iterable
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+
+import aiohttp
+
+from . import api
+from .api import DATA_FIELDS
+from .api import SutroDataApiClient
+from .api import SutroLoginApiClient
+from .snapshot import account_pools
+
+# Groups of fields fetched by default, enough to tell whether devices are
+# online and how old their readings are
+DEFAULT_FIELDS = ("connectivity", "readings")
+
+# Accounts polled at the same time by default
+DEFAULT_CONCURRENCY = 10
+
+_LOGGER = logging.getLogger(__package__)
+
+
+def parse_accounts(lines: Iterable[str]) -> list[dict[str, Any]]:
+    """Return the accounts of the lines of an accounts file."""
+    accounts = []
+    for number, line in enumerate(lines, 1):
+        if not (line := line.strip()) or line.startswith("#"):
+            continue
+        if not line.startswith("{"):
+            accounts.append({"name": f"line {number}", "token": line})
+            continue
+        try:
+            account = json.loads(line)
+        except ValueError as err:
+            raise ValueError(f"line {number} is not valid JSON: {err}") from err
+        if not account.get("token") and not (
+            account.get("email") and account.get("password")
+        ):
+            raise ValueError(f"line {number} has no token nor email and password")
+        account.setdefault("name", account.get("email") or f"line {number}")
+        accounts.append(account)
+    return accounts
+
+
+def _age(timestamp: str | None, now: datetime) -> float | None:
+    """Return the seconds elapsed since an API timestamp."""
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return round((now - parsed).total_seconds(), 1)
+
+
+def summarize_pool(pool: dict[str, Any], now: datetime) -> dict[str, Any]:
+    """Return what the fetched fields tell of the health of a pool."""
+    device = pool.get("device") or {}
+    hub = pool.get("hub") or {}
+    reading = dict(pool.get("latestReading") or {})
+    reading_time = reading.pop("readingTime", None)
+    summary = {
+        "id": pool.get("id"),
+        "type": pool.get("type"),
+        "serial_number": device.get("serialNumber"),
+        "device_online": device.get("online"),
+        "device_last_message": device.get("lastMessage"),
+        "hub_online": hub.get("online"),
+        "battery_level": device.get("batteryLevel"),
+        "reading_time": reading_time,
+        "reading_age_s": _age(reading_time, now),
+    }
+    if reading:
+        summary["reading"] = reading
+    return {key: value for key, value in summary.items() if value is not None}
+
+
+async def async_check_account(
+    session: aiohttp.ClientSession,
+    account: dict[str, Any],
+    fields: Iterable[str],
+) -> dict[str, Any]:
+    """Poll one account and return its NDJSON record."""
+    started = time.monotonic()
+    result: dict[str, Any] = {"account": account["name"], "ok": False}
+
+    if not (token := account.get("token")):
+        login = await SutroLoginApiClient(session).async_get_login(
+            account["email"], account["password"]
+        )
+        token = ((login or {}).get("login") or {}).get("token")
+    response = token and await SutroDataApiClient(token, session).async_get_data(fields)
+    me = response and (response.get("data") or {}).get("me")
+    errors = [
+        error.get("message", "") for error in (response or {}).get("errors") or []
+    ]
+    if not token:
+        result["error"] = "Could not log in"
+    elif not response:
+        result["error"] = "No response from the Sutro API"
+    elif not me:
+        result["error"] = ", ".join(errors) or "No data in the Sutro API response"
+    else:
+        now = datetime.now(timezone.utc)
+        result["ok"] = True
+        pools, _ = account_pools(me, None)
+        result["pools"] = [summarize_pool(pool, now) for pool in pools]
+        if errors:
+            result["errors"] = errors
+
+    result["checked_at"] = datetime.now(timezone.utc).isoformat()
+    result["latency_ms"] = round((time.monotonic() - started) * 1000)
+    return result
+
+
+async def async_check_accounts(
+    accounts: list[dict[str, Any]],
+    fields: Iterable[str],
+    concurrency: int,
+    session: aiohttp.ClientSession,
+) -> int:
+    """Poll the accounts, print a line for each, and return how many failed."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _async_check(account: dict[str, Any]) -> dict[str, Any]:
+        async with semaphore:
+            return await async_check_account(session, account, fields)
+
+    failed = 0
+    for check in asyncio.as_completed([_async_check(account) for account in accounts]):
+        result = await check
+        failed += not result["ok"]
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+    return failed
+
+
+async def async_main(args: argparse.Namespace, accounts: list[dict]) -> int:
+    """Poll the accounts with a session of the kind asked for."""
+    if args.replay:
+        # pylint: disable=import-outside-toplevel
+        from .recording import ReplaySession
+
+        directory, name = os.path.split(args.replay)
+        session = ReplaySession.from_directory(
+            directory or ".", name.removesuffix(".jsonl.gz"), speed=0
+        )
+        return await async_check_accounts(
+            accounts, args.fields, args.concurrency, session
+        )
+
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await async_check_accounts(
+            accounts, args.fields, args.concurrency, session
+        )
+
+
+def main() -> int:
+    """Parse the command line, poll the accounts and return the exit code."""
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.sutro",
+        description=__doc__.splitlines()[0],
+    )
+    parser.add_argument(
+        "accounts",
+        type=argparse.FileType("r", encoding="utf-8"),
+        help="file with one account per line, - for stdin",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="accounts polled at the same time",
+    )
+    parser.add_argument(
+        "--fields",
+        nargs="+",
+        choices=sorted(DATA_FIELDS),
+        default=DEFAULT_FIELDS,
+        help="groups of fields to fetch",
+    )
+    parser.add_argument("--url", default=api.SUTRO_GRAPHSQL_URL, help="API endpoint")
+    parser.add_argument(
+        "--replay", metavar="FILE", help="answer from a recording instead of the API"
+    )
+    parser.add_argument("--verbose", "-v", action="store_true")
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(levelname)s %(name)s: %(message)s",
+    )
+    with args.accounts:
+        try:
+            accounts = parse_accounts(args.accounts)
+        except ValueError as err:
+            parser.error(str(err))
+    api.SUTRO_GRAPHSQL_URL = args.url
+
+    failed = asyncio.run(async_main(args, accounts))
+    if failed:
+        _LOGGER.warning("%s of %s account(s) failed", failed, len(accounts))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
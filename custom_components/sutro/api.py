@@ -5,14 +5,28 @@ import asyncio
 import json
 import logging
 import socket
+import sys
+import time
+from collections.abc import Iterable
 from datetime import datetime
 from datetime import timezone
 from typing import Any
+from typing import TYPE_CHECKING
 
 import aiohttp
-import async_timeout
 
-# Set a timeout of 10 seconds for API requests
+from .latency import LatencyTracker
+
+if sys.version_info >= (3, 11):
+    from asyncio import timeout as async_timeout
+else:
+    # The command line may run on an older Python than Home Assistant needs
+    from async_timeout import timeout as async_timeout
+
+if TYPE_CHECKING:
+    from .recording import ApiRecorder
+
+# Set a timeout of 10 seconds for API requests, until their latency is known
 TIMEOUT = 10
 
 # Initialize a logger for logging errors and debugging
@@ -21,20 +35,114 @@ _LOGGER = logging.getLogger(__package__)
 # URL for the Sutro GraphQL API
 SUTRO_GRAPHSQL_URL = "https://api.mysutro.com/graphql"
 
+# Groups of fields of the ``me`` query that can be fetched on their own. The
+# same object may be selected by several groups, GraphQL merges them.
+DATA_FIELDS = {
+    "device": """
+                device {
+                    batteryLevel
+                    serialNumber
+                    temperature
+                    cartridgeCharges
+                    health
+                    coreStatus
+                    lidOpen
+                    online
+                    shouldTakeReadings
+                    lastMessage
+                    currentFirmwareVersion
+                }""",
+    "hub": """
+                hub {
+                    online
+                    chargerStatus
+                    ssid
+                    lastMessage
+                }""",
+    "connectivity": """
+                device {
+                    serialNumber
+                    online
+                    lastMessage
+                }
+                hub {
+                    online
+                    lastMessage
+                }""",
+    "recommendations": """
+                pool {
+                    latestRecommendations {
+                        conflictWarning
+                        recommendations {
+                            id
+                            chemical {
+                                behaviour
+                                image
+                                name
+                                types
+                                packageSize
+                                packageSizeUnit
+                                upc
+                            }
+                            completedAt
+                            expiredAt
+                            type
+                            decision
+                            explanation
+                            treatment
+                        }
+                    }
+                }""",
+    "readings": """
+                pool {
+                    latestReading {
+                        alkalinity
+                        bromine
+                        chlorine
+                        ph
+                        readingTime
+                    }
+                }""",
+}
+
+# Groups making up the full ``me`` query
+ALL_DATA_FIELDS = ("device", "hub", "recommendations", "readings")
+
 
 class SutroApiClient:
     """Base API Client for making requests to the Sutro API."""
 
-    def __init__(self, session: aiohttp.ClientSession) -> None:
-        """Initialize the API Client."""
+    def __init__(
+        self, session: aiohttp.ClientSession, recorder: ApiRecorder | None = None
+    ) -> None:
+        """Initialize the API Client.
+
+        With a ``recorder``, every request is recorded along with its outcome.
+        """
         self._session = session
+        self.latency = LatencyTracker(TIMEOUT)
+        self.recorder = recorder
 
     async def api_wrapper(
-        self, method: str, url: str, data: Any, headers: dict
+        self,
+        method: str,
+        url: str,
+        data: Any,
+        headers: dict,
+        operation: str = "request",
     ) -> dict | None:
-        """Wrap the API requests to handle errors and exceptions."""
+        """Wrap the API requests to handle errors and exceptions.
+
+        Requests time out based on the latency seen so far for the same
+        ``operation``.
+        """
+        timeout = self.latency.timeout(operation)
+        started = time.monotonic()
+        status: int | None = None
+        result: dict | None = None
+        error: Exception | None = None
         try:
-            async with async_timeout.timeout(TIMEOUT):
+            async with async_timeout(timeout):
                 if method == "get":
                     response = await self._session.get(url, headers=headers)
                 elif method == "post":
@@ -48,22 +156,51 @@ class SutroApiClient:
                 else:
                     raise ValueError("Invalid method specified")
 
-                response.raise_for_status()
-                return await response.json()
+                status = response.status
+                if status == 400:
+                    # GraphQL servers answer documents they reject with their
+                    # errors, which tell them apart from an unreachable API
+                    body = await response.json(content_type=None)
+                    if isinstance(body, dict) and body.get("errors"):
+                        result = body
+                if result is None:
+                    response.raise_for_status()
+                    result = await response.json()
+            self.latency.record(operation, time.monotonic() - started)
         except asyncio.TimeoutError as exception:
+            error = exception
+            self.latency.record(operation, timeout)
             _LOGGER.error(
-                "Timeout error fetching information from %s - %s", url, exception
+                "Timeout error fetching information from %s after %.1fs - %s",
+                url,
+                timeout,
+                exception,
             )
         except aiohttp.ClientError as exception:
+            error = exception
             _LOGGER.error("Error fetching information from %s - %s", url, exception)
         except (KeyError, TypeError, ValueError) as exception:
+            error = exception
             _LOGGER.error("Error parsing information from %s - %s", url, exception)
         except socket.gaierror as exception:
+            error = exception
             _LOGGER.error("Error resolving the hostname - %s", exception)
         except Exception as exception:  # pylint: disable=broad-except
+            error = exception
             _LOGGER.error("Something really wrong happened! - %s", exception)
 
-        return None
+        if self.recorder:
+            self.recorder.record(
+                method,
+                url,
+                data,
+                operation,
+                time.monotonic() - started,
+                status,
+                result,
+                error,
+            )
+        return result
 
 
 class SutroLoginApiClient(SutroApiClient):
@@ -104,78 +241,53 @@ class SutroLoginApiClient(SutroApiClient):
             url=SUTRO_GRAPHSQL_URL,
             data=json.dumps(payload),
             headers=headers,
+            operation="login",
         )
         if response:
-            return response["data"]
+            return response.get("data")
         return None
 
 
 class SutroDataApiClient(SutroApiClient):
     """Sutro API Client class to get data."""
 
-    def __init__(self, token: str, session: aiohttp.ClientSession) -> None:
-        """Inititalize the Data API Class."""
-        super().__init__(session)
+    def __init__(
+        self,
+        token: str,
+        session: aiohttp.ClientSession,
+        hedge: bool = False,
+        recorder: ApiRecorder | None = None,
+    ) -> None:
+        """Inititalize the Data API Class.
+
+        With ``hedge``, a data query still running after the p95 latency of
+        its fields is sent a second time, and the first answer is used.
+        """
+        super().__init__(session, recorder)
         self._token = token
+        self._hedge = hedge
+        # Losing hedged attempts still running
+        self._stragglers: set[asyncio.Future] = set()
 
-    async def async_get_data(self) -> dict | None:
-        """Get data from the API."""
-        query = """
-        {
-            me {
+    async def async_get_data(self, fields: Iterable[str] | None = None) -> dict | None:
+        """Get data from the API.
+
+        Only the given groups of ``DATA_FIELDS`` are queried, the full query
+        by default. The whole GraphQL response is returned, so that callers can
+        tell a partial result from its ``errors`` array.
+        """
+        fields = sorted(fields or ALL_DATA_FIELDS)
+        selection = "".join(DATA_FIELDS[field] for field in fields)
+        query = f"""
+        {{
+            me {{
                 id
                 firstName
-                device {
-                    batteryLevel
-                    serialNumber
-                    temperature
-                    cartridgeCharges
-                    health
-                    coreStatus
-                    lidOpen
-                    online
-                    shouldTakeReadings
-                    lastMessage
-                    currentFirmwareVersion
-                }
-                hub {
-                    online
-                    chargerStatus
-                    ssid
-                    lastMessage
-                }
-                pool {
-                    latestRecommendations {
-                        conflictWarning
-                        recommendations {
-                            id
-                            chemical {
-                                behaviour
-                                image
-                                name
-                                types
-                                packageSize
-                                packageSizeUnit
-                                upc
-                            }
-                            completedAt
-                            expiredAt
-                            type
-                            decision
-                            explanation
-                            treatment
-                        }
-                    }
-                    latestReading {
-                        alkalinity
-                        bromine
-                        chlorine
-                        ph
-                        readingTime
-                    }
-                }
-            }
-        }
+                pool {{
+                    type
+                }}{selection}
+            }}
+        }}
         """
         payload = {
             "query": query,
@@ -184,14 +296,40 @@ class SutroDataApiClient(SutroApiClient):
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self._token}",
         }
-        response = await self.api_wrapper(
-            "post", SUTRO_GRAPHSQL_URL, json.dumps(payload), headers
-        )
-        if response:
-            return response["data"]
-        return None
+        # Queries of different fields have latencies of their own
+        operation = f"data:{'+'.join(fields)}"
+        args = ("post", SUTRO_GRAPHSQL_URL, json.dumps(payload), headers, operation)
+        if not self._hedge or (delay := self.latency.hedge_delay(operation)) is None:
+            return await self.api_wrapper(*args)
 
-    async def async_complete_recommendation(self, recommendation_id) -> dict | None:
+        # Reads are idempotent, so a slow one is raced against a second one.
+        # The loser is left to finish within its timeout rather than being
+        # cancelled, so that its latency still counts toward the hedge delay
+        # and timeouts instead of only ever recording the winners.
+        attempts = {asyncio.ensure_future(self.api_wrapper(*args))}
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if not done:
+                _LOGGER.debug(
+                    "Hedging a %s request slower than %.2fs", operation, delay
+                )
+                attempts.add(asyncio.ensure_future(self.api_wrapper(*args)))
+            while attempts:
+                done, attempts = await asyncio.wait(
+                    attempts, return_when=asyncio.FIRST_COMPLETED
+                )
+                for attempt in done:
+                    if (response := attempt.result()) is not None:
+                        return response
+            return None
+        finally:
+            for attempt in attempts:
+                self._stragglers.add(attempt)
+                attempt.add_done_callback(self._stragglers.discard)
+
+    async def async_complete_recommendation(
+        self, recommendation_id, completed_at: str | None = None
+    ) -> dict | None:
         """Complete a recommendation."""
         query = """
         mutation ($recommendationId: ID!, $completedAt: DateTime) {
@@ -201,13 +339,14 @@ class SutroDataApiClient(SutroApiClient):
             }
         }
         """
-        current_time = datetime.now(timezone.utc).isoformat()
+        if completed_at is None:
+            completed_at = datetime.now(timezone.utc).isoformat()
 
         payload = {
             "query": query,
             "variables": {
                 "recommendationId": recommendation_id,
-                "completedAt": current_time,
+                "completedAt": completed_at,
             },
         }
         headers = {
@@ -215,10 +354,10 @@ class SutroDataApiClient(SutroApiClient):
             "Authorization": f"Bearer {self._token}",
         }
         response = await self.api_wrapper(
-            "post", SUTRO_GRAPHSQL_URL, json.dumps(payload), headers
+            "post", SUTRO_GRAPHSQL_URL, json.dumps(payload), headers, "mutation"
         )
         if response:
-            return response["data"]
+            return response.get("data")
         return None
 
     async def async_uncomplete_recommendation(self, recommendation_id) -> dict | None:
@@ -244,8 +383,58 @@ class SutroDataApiClient(SutroApiClient):
         }
 
         response = await self.api_wrapper(
-            "post", SUTRO_GRAPHSQL_URL, json.dumps(payload), headers
+            "post", SUTRO_GRAPHSQL_URL, json.dumps(payload), headers, "mutation"
         )
         if response:
-            return response["data"]
+            return response.get("data")
         return None
+
+    async def async_update_recommendations(
+        self, changes: dict[str, str | None]
+    ) -> dict | None:
+        """Set the completion time of several recommendations in one request.
+
+        ``changes`` maps recommendation ids to their ``completedAt`` value, or
+        ``None`` to uncomplete them. The result of each mutation is returned
+        keyed by its recommendation id, ``None`` for the mutations that were
+        rejected, which is all of them when Sutro rejected the whole document.
+        ``None`` is returned instead when Sutro could not be reached.
+        """
+        ids = list(changes)
+        arguments = ", ".join(
+            f"$id{index}: ID!, $completedAt{index}: DateTime"
+            for index in range(len(ids))
+        )
+        mutations = "\n".join(
+            f"""
+            m{index}: completeRecommendation(recommendationId: $id{index}, completedAt: $completedAt{index}) {{
+                completedAt
+                success
+            }}"""
+            for index in range(len(ids))
+        )
+        query = f"mutation ({arguments}) {{{mutations}\n}}"
+
+        variables = {}
+        for index, recommendation_id in enumerate(ids):
+            variables[f"id{index}"] = recommendation_id
+            variables[f"completedAt{index}"] = changes[recommendation_id]
+
+        payload = {
+            "query": query,
+            "variables": variables,
+        }
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self._token}",
+        }
+        response = await self.api_wrapper(
+            "post", SUTRO_GRAPHSQL_URL, json.dumps(payload), headers, "mutation"
+        )
+        if response is None:
+            return None
+        data = response.get("data") or {}
+        return {
+            recommendation_id: data.get(f"m{index}")
+            for index, recommendation_id in enumerate(ids)
+        }
@@ -8,6 +8,7 @@ from homeassistant.helpers.entity import EntityCategory
 from .const import DOMAIN
 from .const import ICON_DEVICE_ONLINE
 from .const import NAME
+from .entity import async_add_pool_entities
 from .entity import SutroEntity
 
 logger = logging.getLogger(__name__)
@@ -16,15 +17,18 @@ logger = logging.getLogger(__name__)
 async def async_setup_entry(hass, entry, async_add_devices):
     """Set up the binary sensors for the Sutro integration."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_devices(
-        [
-            DeviceOnlineBinarySensor(coordinator, entry),
-            DeviceLidOpenBinarySensor(coordinator, entry),
-            HubOnlineBinarySensor(coordinator, entry),
-            CoreStatusBinarySensor(coordinator, entry),
-            NotTakingReadingsBinarySensor(coordinator, entry),
-        ]
-    )
+    async_add_pool_entities(coordinator, entry, async_add_devices, _create_sensors)
+
+
+def _create_sensors(coordinator, entry, pool_id):
+    """Create the binary sensors of a pool."""
+    return [
+        DeviceOnlineBinarySensor(coordinator, entry, pool_id),
+        DeviceLidOpenBinarySensor(coordinator, entry, pool_id),
+        HubOnlineBinarySensor(coordinator, entry, pool_id),
+        CoreStatusBinarySensor(coordinator, entry, pool_id),
+        NotTakingReadingsBinarySensor(coordinator, entry, pool_id),
+    ]
 
 
 class SutroBinarySensor(SutroEntity, BinarySensorEntity):
@@ -34,33 +38,27 @@ class SutroBinarySensor(SutroEntity, BinarySensorEntity):
 class SutroDeviceBinarySensor(SutroBinarySensor):
     """Base class for Sutro Device Binary Sensors."""
 
-    @property
-    def extra_state_attributes(self):
-        """Return a dictionary containing the last message."""
-        return {"last_message": self.coordinator.data["me"]["device"]["lastMessage"]}
+    _section = "device"
 
 
 class SutroHubBinarySensor(SutroBinarySensor):
     """Base class for Sutro Hub Binary Sensors."""
 
-    @property
-    def extra_state_attributes(self):
-        """Return a dictionary containing the last message."""
-        return {"last_message": self.coordinator.data["me"]["hub"]["lastMessage"]}
+    _section = "hub"
 
 
 class DeviceOnlineBinarySensor(SutroDeviceBinarySensor):
     """Representation of a Device Online Binary Sensor."""
 
     _attr_name = f"{NAME} Device Online"
+    _heartbeat = True
     _attr_icon = ICON_DEVICE_ONLINE
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
     @property
     def unique_id(self):
         """Return a unique ID to use for the binary sensor."""
-        device_serial = self.coordinator.data["me"]["device"]["serialNumber"]
-        return f"{device_serial}-device-online"
+        return f"{self.serial_number}-device-online"
 
     @property
     def device_class(self):
@@ -70,7 +68,7 @@ class DeviceOnlineBinarySensor(SutroDeviceBinarySensor):
     @property
     def is_on(self):
         """Return true if the device is connected."""
-        return self.coordinator.data["me"]["device"]["online"]
+        return self.pool["device"]["online"]
 
 
 class DeviceLidOpenBinarySensor(SutroDeviceBinarySensor):
@@ -81,8 +79,7 @@ class DeviceLidOpenBinarySensor(SutroDeviceBinarySensor):
     @property
     def unique_id(self):
         """Return a unique ID to use for the binary sensor."""
-        device_serial = self.coordinator.data["me"]["device"]["serialNumber"]
-        return f"{device_serial}-lid-open"
+        return f"{self.serial_number}-lid-open"
 
     @property
     def device_class(self):
@@ -92,7 +89,7 @@ class DeviceLidOpenBinarySensor(SutroDeviceBinarySensor):
     @property
     def is_on(self):
         """Return true if the binary_sensor is on."""
-        return self.coordinator.data["me"]["device"]["lidOpen"]
+        return self.pool["device"]["lidOpen"]
 
 
 class CoreStatusBinarySensor(SutroDeviceBinarySensor):
@@ -104,8 +101,7 @@ class CoreStatusBinarySensor(SutroDeviceBinarySensor):
     @property
     def unique_id(self):
         """Return a unique ID to use for the binary sensor."""
-        device_serial = self.coordinator.data["me"]["device"]["serialNumber"]
-        return f"{device_serial}-core-status"
+        return f"{self.serial_number}-core-status"
 
     @property
     def device_class(self):
@@ -115,7 +111,7 @@ class CoreStatusBinarySensor(SutroDeviceBinarySensor):
     @property
     def is_on(self):
         """Return true if the device has a problem."""
-        return not self.coordinator.data["me"]["device"]["coreStatus"]
+        return not self.pool["device"]["coreStatus"]
 
 
 class NotTakingReadingsBinarySensor(SutroDeviceBinarySensor):
@@ -127,8 +123,7 @@ class NotTakingReadingsBinarySensor(SutroDeviceBinarySensor):
     @property
     def unique_id(self):
         """Return a unique ID to use for the binary sensor."""
-        device_serial = self.coordinator.data["me"]["device"]["serialNumber"]
-        return f"{device_serial}-not-taking-readings"
+        return f"{self.serial_number}-not-taking-readings"
 
     @property
     def device_class(self):
@@ -138,21 +133,21 @@ class NotTakingReadingsBinarySensor(SutroDeviceBinarySensor):
     @property
     def is_on(self):
         """Return true if the device is fine."""
-        return not self.coordinator.data["me"]["device"]["shouldTakeReadings"]
+        return not self.pool["device"]["shouldTakeReadings"]
 
 
 class HubOnlineBinarySensor(SutroHubBinarySensor):
     """Representation of a Hub Online Binary Sensor."""
 
     _attr_name = f"{NAME} Hub Online"
+    _heartbeat = True
     _attr_icon = ICON_DEVICE_ONLINE
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
     @property
     def unique_id(self):
         """Return a unique ID to use for the binary sensor."""
-        device_serial = self.coordinator.data["me"]["device"]["serialNumber"]
-        return f"{device_serial}-hub-online"
+        return f"{self.serial_number}-hub-online"
 
     @property
     def device_class(self):
@@ -162,4 +157,4 @@ class HubOnlineBinarySensor(SutroHubBinarySensor):
     @property
     def is_on(self):
         """Return true if the device is connected."""
-        return self.coordinator.data["me"]["hub"]["online"]
+        return self.pool["hub"]["online"]
@@ -6,11 +6,23 @@ from homeassistant import config_entries
 from homeassistant.const import CONF_EMAIL
 from homeassistant.const import CONF_PASSWORD
 from homeassistant.const import CONF_TOKEN
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
 from .api import SutroLoginApiClient
+from .const import CONF_EXPORT_FORMAT
+from .const import CONF_HEARTBEAT_INTERVAL
+from .const import CONF_HEDGE_REQUESTS
+from .const import CONF_RECORD_REQUESTS
+from .const import DEFAULT_HEARTBEAT_INTERVAL
 from .const import DOMAIN
+from .const import EXPORT_FORMATS
+from .const import EXPORT_NONE
+from .const import EXPORT_PARQUET
+from .const import MAX_HEARTBEAT_INTERVAL
+from .const import MIN_HEARTBEAT_INTERVAL
+from .export import parquet_available
 
 
 class SutroFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -50,6 +62,12 @@ class SutroFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
         return await self._show_config_form(user_input)
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Get the options flow for this handler."""
+        return SutroOptionsFlowHandler(config_entry)
+
     async def _show_config_form(self, user_input):  # pylint: disable=unused-argument
         """Show the configuration form to edit location data."""
         return self.async_show_form(
@@ -72,3 +90,65 @@ class SutroFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         except Exception as ex:
             self.hass.components.logger.error(f"Failed to get login data: {ex}")
         return None
+
+
+class SutroOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for sutro."""
+
+    def __init__(self, config_entry):
+        """Initialize options flow."""
+        self.config_entry = config_entry
+        self.options = dict(config_entry.options)
+
+    async def async_step_init(self, user_input=None) -> FlowResult:
+        """Manage the options."""
+        errors = {}
+        parquet = await self.hass.async_add_executor_job(parquet_available)
+        if user_input is not None:
+            if user_input[CONF_EXPORT_FORMAT] == EXPORT_PARQUET and not parquet:
+                errors[CONF_EXPORT_FORMAT] = "parquet_unavailable"
+            elif 0 < user_input[CONF_HEARTBEAT_INTERVAL] < MIN_HEARTBEAT_INTERVAL:
+                # Every heartbeat is a request to Sutro
+                errors[CONF_HEARTBEAT_INTERVAL] = "heartbeat_too_short"
+            else:
+                self.options.update(user_input)
+                return self.async_create_entry(title="", data=self.options)
+
+        # Show the values entered when the form has errors
+        values = {**self.options, **(user_input or {})}
+        # Parquet is only offered with pyarrow, or to show it is still chosen
+        formats = [
+            export_format
+            for export_format in EXPORT_FORMATS
+            if export_format != EXPORT_PARQUET
+            or parquet
+            or values.get(CONF_EXPORT_FORMAT) == EXPORT_PARQUET
+        ]
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_EXPORT_FORMAT,
+                        default=values.get(CONF_EXPORT_FORMAT, EXPORT_NONE),
+                    ): vol.In(formats),
+                    vol.Required(
+                        CONF_HEARTBEAT_INTERVAL,
+                        default=values.get(
+                            CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=MAX_HEARTBEAT_INTERVAL)
+                    ),
+                    vol.Required(
+                        CONF_HEDGE_REQUESTS,
+                        default=values.get(CONF_HEDGE_REQUESTS, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_RECORD_REQUESTS,
+                        default=values.get(CONF_RECORD_REQUESTS, False),
+                    ): bool,
+                }
+            ),
+            errors=errors,
+        )
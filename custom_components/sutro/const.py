@@ -20,13 +20,52 @@ ICON_BATTERY = "mdi:battery"
 ICON_CHARGES = "mdi:water-outline"
 ICON_DEVICE_ONLINE = "mdi:check-network-outline"
 ICON_HEALTH = "mdi:hospital-box"
+ICON_TIMER = "mdi:timer-sand"
 ICON_WIFI = "mdi:wifi"
 
-# Platforms
-PLATFORMS = [Platform.SENSOR, Platform.BINARY_SENSOR, Platform.TODO]
+# Platforms, with the section a pool needs besides its device to have entities
+# on them. Only the platforms with entities are set up.
+PLATFORM_SECTIONS: dict[Platform, str | None] = {
+    Platform.SENSOR: None,
+    Platform.BINARY_SENSOR: None,
+    Platform.TODO: "latestRecommendations",
+}
+
+# Events
+EVENT_DEVICE_OFFLINE = f"{DOMAIN}_device_offline"
+EVENT_LID_OPENED = f"{DOMAIN}_lid_opened"
+EVENT_NEW_READING = f"{DOMAIN}_new_reading"
+EVENT_NEW_RECOMMENDATION = f"{DOMAIN}_new_recommendation"
+
+# Dispatcher signal sent, with the entry id, when a heartbeat probe is applied
+SIGNAL_HEARTBEAT = f"{DOMAIN}_heartbeat_{{}}"
 
 # Configuration and options
 CONF_TOKEN = "token"
+CONF_EXPORT_FORMAT = "export_format"
+CONF_HEARTBEAT_INTERVAL = "heartbeat_interval"
+CONF_HEDGE_REQUESTS = "hedge_requests"
+CONF_RECORD_REQUESTS = "record_requests"
+
+# Seconds between two probes of whether devices and hubs are online, 0 for none.
+# Every probe is a request to Sutro, so the heartbeat is opt-in.
+DEFAULT_HEARTBEAT_INTERVAL = 0
+MIN_HEARTBEAT_INTERVAL = 60
+MAX_HEARTBEAT_INTERVAL = 1800
+
+# Formats of the reading export
+EXPORT_NONE = "none"
+EXPORT_CSV = "csv"
+EXPORT_PARQUET = "parquet"
+EXPORT_FORMATS = [EXPORT_NONE, EXPORT_CSV, EXPORT_PARQUET]
+
+# Services
+SERVICE_PROFILE = "profile"
+SERVICE_REFRESH = "refresh"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_CYCLES = "cycles"
+ATTR_FIELDS = "fields"
 
 # Logging
 STARTUP_MESSAGE = f"""
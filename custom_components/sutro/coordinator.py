@@ -0,0 +1,330 @@
+"""DataUpdateCoordinator of the Sutro integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import datetime
+from datetime import timedelta
+
+from homeassistant.const import Platform
+from homeassistant.core import callback
+from homeassistant.core import CALLBACK_TYPE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .api import ALL_DATA_FIELDS
+from .api import SutroDataApiClient
+from .const import DOMAIN
+from .const import SIGNAL_HEARTBEAT
+from .events import async_fire_events
+from .export import SutroReadingExport
+from .forecast import DepletionEstimator
+from .mutations import SutroMutationQueue
+from .profiler import SutroProfiler
+from .snapshot import account_pools
+from .snapshot import FIELD_SECTIONS
+from .snapshot import merge_pools
+from .snapshot import PARTIAL_FIELDS
+
+SCAN_INTERVAL = timedelta(minutes=30)
+
+STORAGE_VERSION = 1
+
+# Delay before the learned consumption rates are saved, in seconds
+FORECAST_SAVE_DELAY = 60
+
+# Battery readings jitter by a percent or two, only a real charge resets them
+BATTERY_RESET_THRESHOLD = 5
+
+# How soon to retry sending queued recommendation updates after a failure,
+# doubling after every failed retry up to the maximum
+MUTATION_RETRY_INTERVAL = timedelta(minutes=1)
+MUTATION_MAX_RETRY_INTERVAL = timedelta(minutes=16)
+
+# How long a section that keeps failing is served from its last good value
+SECTION_STALE_AFTER = timedelta(hours=2)
+
+# Groups of fields the heartbeat probes between full polls
+HEARTBEAT_FIELDS = ("connectivity",)
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+
+def _get_forecast_store(hass: HomeAssistant, entry_id: str) -> Store[dict]:
+    """Return the store of the depletion estimators of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.forecasts")
+
+
+async def async_remove_forecasts(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the persisted depletion estimators of a config entry."""
+    await _get_forecast_store(hass, entry_id).async_remove()
+
+
+def _online(pool: dict) -> tuple[bool | None, bool | None]:
+    """Return whether the device and hub of a pool are online."""
+    return (
+        (pool["device"] or {}).get("online"),
+        (pool["hub"] or {}).get("online"),
+    )
+
+
+class SutroDataUpdateCoordinator(DataUpdateCoordinator):
+    """Class to manage fetching data from the API."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: SutroDataApiClient,
+        mutations: SutroMutationQueue,
+        export: SutroReadingExport | None = None,
+    ) -> None:
+        """Initialize."""
+        self.api = client
+        self.mutations = mutations
+        self.export = export
+        self._cancel_mutation_retry: CALLBACK_TYPE | None = None
+        self._mutation_retry_interval = MUTATION_RETRY_INTERVAL
+        self.battery_forecasts: defaultdict[str, DepletionEstimator] = defaultdict(
+            lambda: DepletionEstimator(BATTERY_RESET_THRESHOLD)
+        )
+        self.cartridge_forecasts: defaultdict[str, DepletionEstimator] = defaultdict(
+            DepletionEstimator
+        )
+        # Keyed by (pool id, section)
+        self.failed_sections: set[tuple[str, str]] = set()
+        self.section_updated: dict[tuple[str, str], datetime] = {}
+        self.profiler: SutroProfiler | None = None
+        self._forecast_store: Store[dict] | None = None
+        # Platforms set up for the entry, as their features show up
+        self.platforms: set[Platform] = set()
+        self._heartbeat_lock = asyncio.Lock()
+
+        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=SCAN_INTERVAL)
+
+    async def async_load_forecasts(self) -> None:
+        """Restore the consumption rates learned before a restart."""
+        self._forecast_store = _get_forecast_store(
+            self.hass, self.config_entry.entry_id
+        )
+        if not (data := await self._forecast_store.async_load()):
+            return
+        for pool_id, estimator in data["battery"].items():
+            self.battery_forecasts[pool_id] = DepletionEstimator.from_dict(
+                estimator, BATTERY_RESET_THRESHOLD
+            )
+        for pool_id, estimator in data["cartridge"].items():
+            self.cartridge_forecasts[pool_id] = DepletionEstimator.from_dict(estimator)
+
+    @callback
+    def _forecasts_to_save(self) -> dict:
+        """Return the data of the store of the depletion estimators."""
+        return {
+            "battery": {
+                pool_id: estimator.as_dict()
+                for pool_id, estimator in self.battery_forecasts.items()
+            },
+            "cartridge": {
+                pool_id: estimator.as_dict()
+                for pool_id, estimator in self.cartridge_forecasts.items()
+            },
+        }
+
+    async def _async_update_data(self):
+        """Update data via library."""
+        if self.mutations.pending:
+            await self._async_flush_mutations()
+
+        return await self._async_fetch(ALL_DATA_FIELDS)
+
+    async def async_refresh_fields(self, fields: Iterable[str]) -> None:
+        """Fetch only some groups of fields and merge them into the data.
+
+        Like the heartbeat, this leaves the schedule of full polls alone, so
+        that the other fields and queued updates are still synced by them.
+        """
+        self.data = await self._async_fetch(fields)
+        self.async_update_listeners()
+
+    async def _async_query(self, fields: Iterable[str]) -> tuple[dict, list, list]:
+        """Query groups of fields, returning ``me``, its pools and the errors."""
+        try:
+            response = await self.api.async_get_data(fields)
+        except Exception as exception:
+            raise UpdateFailed() from exception
+
+        if not response:
+            raise UpdateFailed("No response from the Sutro API")
+        me = (response.get("data") or {}).get("me")
+        if not me:
+            errors = response.get("errors") or []
+            raise UpdateFailed(
+                ", ".join(error.get("message", "") for error in errors)
+                or "No data in the Sutro API response"
+            )
+        pools, errors = account_pools(me, response.get("errors"))
+        for field in ("device", "hub", "pool"):
+            me.pop(field, None)
+        return me, pools, errors
+
+    async def async_heartbeat(self, _now=None) -> None:
+        """Probe whether the devices and hubs are online, between full polls.
+
+        Only the connectivity entities are updated, through a dispatcher
+        signal. A device or hub going online or offline, or a pool showing up,
+        escalates to a full refresh.
+        """
+        if not self.data or self._heartbeat_lock.locked():
+            return
+        async with self._heartbeat_lock:
+            try:
+                _, result, errors = await self._async_query(HEARTBEAT_FIELDS)
+            except UpdateFailed as err:
+                _LOGGER.debug("Sutro heartbeat failed: %s", err)
+                return
+
+        previous = self.data["pools"]
+        pools, _ = merge_pools(previous, result, errors, FIELD_SECTIONS["connectivity"])
+        if pools.keys() != previous.keys():
+            # New pools need the full query for their entities to be created
+            await self.async_request_refresh()
+            return
+
+        changed = False
+        for pool_id, pool in pools.items():
+            async_fire_events(self.hass, previous[pool_id], pool)
+            changed |= _online(pool) != _online(previous[pool_id])
+        self.data = {**self.data, "pools": pools}
+        async_dispatcher_send(
+            self.hass, SIGNAL_HEARTBEAT.format(self.config_entry.entry_id)
+        )
+        if changed:
+            _LOGGER.debug("Sutro connectivity changed, refreshing everything")
+            await self.async_request_refresh()
+
+    async def _async_fetch(self, fields: Iterable[str]) -> dict:
+        """Fetch groups of fields and merge them with the last good data."""
+        started = time.perf_counter()
+        me, result, errors = await self._async_query(fields)
+        if self.profiler:
+            self.profiler.record_phase("fetch", time.perf_counter() - started)
+            started = time.perf_counter()
+
+        sections = {section for field in fields for section in FIELD_SECTIONS[field]}
+        # Sections fetched in full, as opposed to a few of their fields
+        fresh = {
+            section
+            for field in fields
+            if field not in PARTIAL_FIELDS
+            for section in FIELD_SECTIONS[field]
+        }
+        previous = self.data["pools"] if self.data else {}
+        pools, failed = merge_pools(previous, result, errors, sections)
+        self.failed_sections = {
+            (pool_id, section)
+            for pool_id, section in self.failed_sections
+            if section not in fresh
+        } | failed
+        if failed:
+            _LOGGER.debug(
+                "Keeping last good %s",
+                ", ".join(
+                    f"{section} of pool {pool_id}" for pool_id, section in failed
+                ),
+            )
+
+        now = dt_util.utcnow()
+        for pool_id, pool in pools.items():
+            for section in fresh:
+                if (pool_id, section) not in failed:
+                    self.section_updated[pool_id, section] = now
+            if (pool_id, "device") not in failed and "device" in fresh:
+                self._update_forecasts(pool_id, pool["device"])
+            async_fire_events(self.hass, previous.get(pool_id), pool)
+            if self.export and (pool_id, "latestReading") not in failed:
+                self.export.async_add(pool_id, pool["latestReading"])
+        if self._forecast_store and "device" in fresh:
+            self._forecast_store.async_delay_save(
+                self._forecasts_to_save, FORECAST_SAVE_DELAY
+            )
+
+        if self.profiler:
+            self.profiler.record_phase("process", time.perf_counter() - started)
+        return {"me": me, "pools": pools}
+
+    def section_available(self, pool_id: str, section: str) -> bool:
+        """Return whether a section of a pool is recent enough to be shown."""
+        updated = self.section_updated.get((pool_id, section))
+        return updated is not None and dt_util.utcnow() - updated < SECTION_STALE_AFTER
+
+    async def async_update_recommendation(
+        self, recommendation_id: str, completed: bool
+    ) -> None:
+        """Queue a recommendation update and push it to the API."""
+        completed_at = dt_util.utcnow().isoformat() if completed else None
+        await self.mutations.async_enqueue(recommendation_id, completed_at)
+        # Show the queued update right away, even if the API is unreachable
+        self.async_update_listeners()
+        await self.async_request_refresh()
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled retry and write out what is still buffered."""
+        await super().async_shutdown()
+        if self._cancel_mutation_retry:
+            self._cancel_mutation_retry()
+            self._cancel_mutation_retry = None
+        if self.export:
+            await self.export.async_flush()
+        if self.api.recorder:
+            await self.hass.async_add_executor_job(self.api.recorder.close)
+
+    async def _async_flush_mutations(self) -> bool:
+        """Send queued updates, retrying later if the API is unreachable.
+
+        Returns whether every queued update could be sent.
+        """
+        if await self.mutations.async_flush():
+            self._mutation_retry_interval = MUTATION_RETRY_INTERVAL
+            return True
+        if self._cancel_mutation_retry:
+            return False
+
+        _LOGGER.warning(
+            "Could not sync %s recommendation update(s), retrying in %s",
+            len(self.mutations.pending),
+            self._mutation_retry_interval,
+        )
+        self._cancel_mutation_retry = async_call_later(
+            self.hass, self._mutation_retry_interval, self._async_retry_mutations
+        )
+        self._mutation_retry_interval = min(
+            self._mutation_retry_interval * 2, MUTATION_MAX_RETRY_INTERVAL
+        )
+        return False
+
+    async def _async_retry_mutations(self, _now) -> None:
+        """Retry sending the queued updates, without polling everything."""
+        self._cancel_mutation_retry = None
+        if self.mutations.pending and await self._async_flush_mutations():
+            # Fetch the recommendations as Sutro now has them
+            await self.async_request_refresh()
+
+    def _update_forecasts(self, pool_id: str, device: dict | None) -> None:
+        """Feed the latest consumable levels into the depletion estimators."""
+        if device is None:
+            return
+        last_message = device["lastMessage"] and dt_util.parse_datetime(
+            device["lastMessage"]
+        )
+        sampled_at = dt_util.as_utc(last_message) if last_message else dt_util.utcnow()
+        battery = device["batteryLevel"]
+        charges = device["cartridgeCharges"]
+        self.battery_forecasts[pool_id].update(battery and float(battery), sampled_at)
+        self.cartridge_forecasts[pool_id].update(charges and int(charges), sampled_at)
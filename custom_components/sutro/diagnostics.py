@@ -0,0 +1,45 @@
+"""Diagnostics support for Sutro."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_TOKEN
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .snapshot import SECTIONS
+
+TO_REDACT = {CONF_TOKEN, "serialNumber", "ssid"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "sections": {
+            pool_id: {
+                section: {
+                    "available": coordinator.section_available(pool_id, section),
+                    "failed": (pool_id, section) in coordinator.failed_sections,
+                    "last_updated": (
+                        updated.isoformat()
+                        if (
+                            updated := coordinator.section_updated.get(
+                                (pool_id, section)
+                            )
+                        )
+                        else None
+                    ),
+                }
+                for section in SECTIONS
+            }
+            for pool_id in coordinator.data["pools"]
+        },
+        "latency": coordinator.api.latency.summary(),
+        "data": async_redact_data(coordinator.data, TO_REDACT),
+    }
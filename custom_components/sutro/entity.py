@@ -1,32 +1,160 @@
 """SutroEntity class."""
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from collections.abc import Iterable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import ATTRIBUTION
 from .const import DOMAIN
 from .const import NAME
+from .const import SIGNAL_HEARTBEAT
 from .const import VERSION
 
 
+def hub_identifier(serial_number: str) -> str:
+    """Return the device identifier of the hub paired with a Sutro device."""
+    # The API does not identify hubs, each one serves a single device
+    return f"{serial_number}-hub"
+
+
+def hub_device_info(serial_number: str) -> DeviceInfo:
+    """Return the information of the hub paired with a Sutro device."""
+    return {
+        "identifiers": {(DOMAIN, hub_identifier(serial_number))},
+        "name": f"{NAME} Hub",
+        "model": VERSION,
+        "manufacturer": NAME,
+    }
+
+
+def pool_has_entities(pool: dict, section: str | None = None) -> bool:
+    """Return whether a pool has entities on a platform needing a section."""
+    return bool(pool["device"]) and (section is None or pool[section] is not None)
+
+
+@callback
+def async_add_pool_entities(
+    coordinator,
+    entry: ConfigEntry,
+    async_add_entities: Callable[[list[Entity]], None],
+    create_entities: Callable[..., Iterable[Entity]],
+    section: str | None = None,
+) -> None:
+    """Add the entities of every pool with a device, now and as they appear.
+
+    ``create_entities`` is called with the coordinator, the entry and the id
+    of each new pool. With a ``section``, pools also need it to be present
+    to get entities.
+    """
+    added: set[str] = set()
+
+    @callback
+    def _async_add_new_pools() -> None:
+        pools = coordinator.data["pools"]
+        new = [
+            pool_id
+            for pool_id, pool in pools.items()
+            if pool_id not in added and pool_has_entities(pool, section)
+        ]
+        if not new:
+            return
+        added.update(new)
+        # Devices refer to their hub, which has to be registered first
+        device_registry = dr.async_get(coordinator.hass)
+        for pool_id in new:
+            device_registry.async_get_or_create(
+                config_entry_id=entry.entry_id,
+                **hub_device_info(pools[pool_id]["device"]["serialNumber"]),
+            )
+        async_add_entities(
+            [
+                entity
+                for pool_id in new
+                for entity in create_entities(coordinator, entry, pool_id)
+            ]
+        )
+
+    _async_add_new_pools()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_new_pools))
+
+
 class SutroEntity(CoordinatorEntity):
     """Representation of a Sutro Entity."""
 
-    def __init__(self, coordinator, config_entry):
+    # Section of the pool data this entity depends on
+    _section: str | None = None
+
+    # Whether the heartbeat between full polls updates this entity
+    _heartbeat = False
+
+    def __init__(self, coordinator, config_entry, pool_id):
         """Initialize the entity."""
         super().__init__(coordinator)
         self.config_entry = config_entry
+        self.pool_id = pool_id
+        self.serial_number = self.pool["device"]["serialNumber"]
+
+    async def async_added_to_hass(self) -> None:
+        """Also write the state when a heartbeat probe is applied."""
+        await super().async_added_to_hass()
+        if self._heartbeat:
+            self.async_on_remove(
+                async_dispatcher_connect(
+                    self.hass,
+                    SIGNAL_HEARTBEAT.format(self.config_entry.entry_id),
+                    self.async_write_ha_state,
+                )
+            )
+
+    @property
+    def pool(self):
+        """Return the data of the pool this entity belongs to."""
+        return self.coordinator.data["pools"][self.pool_id]
+
+    @property
+    def available(self):
+        """Return whether the section backing this entity is available."""
+        return (
+            super().available
+            and self.pool_id in self.coordinator.data["pools"]
+            and (
+                self._section is None
+                or self.coordinator.section_available(self.pool_id, self._section)
+            )
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state, timing it while the coordinator is profiled."""
+        if (profiler := self.coordinator.profiler) is None:
+            super()._handle_coordinator_update()
+            return
+
+        started = time.perf_counter()
+        super()._handle_coordinator_update()
+        profiler.record_state_write(self.entity_id, time.perf_counter() - started)
 
     @property
     def device_info(self):
         """Return the parent device information."""
-        device_unique_id = self.coordinator.data["me"]["device"]["serialNumber"]
+        if self._section == "hub":
+            return hub_device_info(self.serial_number)
         return {
-            "identifiers": {(DOMAIN, device_unique_id)},
-            "name": NAME,
+            "identifiers": {(DOMAIN, self.serial_number)},
+            "name": f"{NAME} {(self.pool.get('type') or '').title()}".strip(),
             "model": VERSION,
             "manufacturer": NAME,
-            "sw_version": self.coordinator.data["me"]["device"][
-                "currentFirmwareVersion"
-            ],
+            "sw_version": self.pool["device"]["currentFirmwareVersion"],
+            "via_device": (DOMAIN, hub_identifier(self.serial_number)),
         }
 
     @property
@@ -0,0 +1,70 @@
+"""Events fired by Sutro on changes in the polled data."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import callback
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from .const import DOMAIN
+from .const import EVENT_DEVICE_OFFLINE
+from .const import EVENT_LID_OPENED
+from .const import EVENT_NEW_READING
+from .const import EVENT_NEW_RECOMMENDATION
+
+ATTR_SERIAL_NUMBER = "serial_number"
+
+
+def _recommendations(pool: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return the latest recommendations of a pool snapshot."""
+    latest = pool["latestRecommendations"]
+    return (latest and latest["recommendations"]) or []
+
+
+@callback
+def async_fire_events(
+    hass: HomeAssistant, previous: dict[str, Any] | None, pool: dict[str, Any]
+) -> None:
+    """Fire an event for each transition between two snapshots of a pool.
+
+    Nothing is fired for the first snapshot of a pool, as there is nothing it
+    could have changed from.
+    """
+    if previous is None:
+        return
+
+    device = pool["device"] or {}
+    previous_device = previous["device"] or {}
+    serial_number = device.get("serialNumber")
+    device_entry = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, serial_number)}
+    )
+    base = {
+        ATTR_DEVICE_ID: device_entry and device_entry.id,
+        ATTR_SERIAL_NUMBER: serial_number,
+    }
+
+    reading = pool["latestReading"]
+    previous_reading = previous["latestReading"]
+    if reading and reading["readingTime"] != (
+        previous_reading and previous_reading["readingTime"]
+    ):
+        hass.bus.async_fire(EVENT_NEW_READING, {**base, "reading": reading})
+
+    known = {recommendation["id"] for recommendation in _recommendations(previous)}
+    for recommendation in _recommendations(pool):
+        if recommendation["id"] not in known:
+            hass.bus.async_fire(
+                EVENT_NEW_RECOMMENDATION,
+                {**base, "recommendation": recommendation},
+            )
+
+    if previous_device.get("online") and device.get("online") is False:
+        hass.bus.async_fire(
+            EVENT_DEVICE_OFFLINE, {**base, "last_message": device.get("lastMessage")}
+        )
+
+    if previous_device.get("lidOpen") is False and device.get("lidOpen"):
+        hass.bus.async_fire(EVENT_LID_OPENED, base)
@@ -0,0 +1,277 @@
+"""Append-only export of the Sutro readings to local files."""
+from __future__ import annotations
+
+import asyncio
+import csv
+import logging
+import os
+from abc import ABC
+from abc import abstractmethod
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.core import CALLBACK_TYPE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .const import EXPORT_CSV
+from .const import EXPORT_PARQUET
+
+STORAGE_VERSION = 1
+
+# Delay before buffered readings are saved to the store, grouping the saves
+# of the readings of one refresh
+SAVE_DELAY = 10
+
+# Columns of the export, in order
+COLUMNS = ("pool_id", "readingTime", "alkalinity", "bromine", "chlorine", "ph")
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+
+def _period(reading_time: str) -> str:
+    """Return the month a reading belongs to, which names its file."""
+    try:
+        parsed = datetime.fromisoformat(reading_time)
+    except (TypeError, ValueError):
+        return "unknown"
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return f"{parsed:%Y-%m}"
+
+
+def _by_period(rows: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    """Group rows by the month of their reading, keeping their order."""
+    periods: dict[str, list[dict[str, Any]]] = {}
+    for row in rows:
+        periods.setdefault(_period(row["readingTime"]), []).append(row)
+    return periods
+
+
+class ReadingWriter(ABC):
+    """Base class of the writers of readings to one file per month."""
+
+    extension = ""
+    # Readings buffered before they are written out
+    batch_size = 50
+    # Longest time a reading is buffered before it is written out
+    flush_interval = timedelta(minutes=15)
+
+    def __init__(self, directory: str, prefix: str) -> None:
+        """Initialize the writer."""
+        self._directory = directory
+        self._prefix = prefix
+
+    def _path(self, period: str) -> str:
+        """Return the path of the file of a month."""
+        return os.path.join(
+            self._directory, f"{self._prefix}_{period}.{self.extension}"
+        )
+
+    @abstractmethod
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        """Append rows to the files of their month."""
+
+
+class CsvReadingWriter(ReadingWriter):
+    """Append readings to one CSV file per month.
+
+    Only appends to the file of each month, which is never read back or
+    rewritten. The header is written when a file is created.
+    """
+
+    extension = "csv"
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        """Append rows to the files of their month."""
+        os.makedirs(self._directory, exist_ok=True)
+        for period, period_rows in _by_period(rows).items():
+            path = self._path(period)
+            new = not os.path.exists(path) or os.path.getsize(path) == 0
+            with open(path, "a", encoding="utf-8", newline="") as file:
+                writer = csv.DictWriter(file, COLUMNS, extrasaction="ignore")
+                if new:
+                    writer.writeheader()
+                writer.writerows(period_rows)
+
+
+class ParquetReadingWriter(ReadingWriter):
+    """Write readings to Parquet files of one month, one file per write.
+
+    Parquet files cannot be appended to, and one left open has no footer and
+    cannot be read at all if Home Assistant stops without closing it. So
+    every write creates a complete file of its own, next to those of earlier
+    writes of the month, with a numbered suffix. Readings are buffered for a
+    day to keep the files few and their row groups large.
+    """
+
+    extension = "parquet"
+    batch_size = 1000
+    flush_interval = timedelta(days=1)
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        """Write rows to new files of their month."""
+        # pylint: disable=import-outside-toplevel
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema(
+            [
+                ("pool_id", pa.string()),
+                ("readingTime", pa.timestamp("us", tz="UTC")),
+                ("alkalinity", pa.float64()),
+                ("bromine", pa.float64()),
+                ("chlorine", pa.float64()),
+                ("ph", pa.float64()),
+            ]
+        )
+        os.makedirs(self._directory, exist_ok=True)
+        for period, period_rows in _by_period(rows).items():
+            columns: dict[str, list] = {
+                "pool_id": [row["pool_id"] for row in period_rows],
+                "readingTime": [
+                    datetime.fromisoformat(row["readingTime"]) for row in period_rows
+                ],
+            }
+            for column in COLUMNS[2:]:
+                columns[column] = [
+                    None if row.get(column) is None else float(row[column])
+                    for row in period_rows
+                ]
+            path = self._path(period)
+            part = 0
+            while os.path.exists(path):
+                part += 1
+                path = self._path(f"{period}.{part}")
+            # Only a complete file ever gets the name of a part
+            pq.write_table(pa.table(columns, schema=schema), f"{path}.tmp")
+            os.replace(f"{path}.tmp", path)
+
+
+def parquet_available() -> bool:
+    """Return whether the Parquet export can be used."""
+    try:
+        # pylint: disable=import-outside-toplevel,unused-import
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _get_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store of the readings exported for an entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.export")
+
+
+async def async_remove_export_state(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove what is known of the readings exported for an entry."""
+    await _get_store(hass, entry_id).async_remove()
+
+
+class SutroReadingExport:
+    """Buffer new readings and append them to local files off the loop.
+
+    The buffered readings and the time of the last reading exported for each
+    pool are stored, so a reading is exported once even across restarts, and
+    none is lost to one.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, export_format: str):
+        """Initialize the export."""
+        self.hass = hass
+        self._store = _get_store(hass, entry_id)
+        self._format = export_format
+        self._directory = hass.config.path(f"{DOMAIN}_export")
+        self._prefix = f"readings_{entry_id}"
+        self._writer: ReadingWriter | None = None
+        self._lock = asyncio.Lock()
+        self._buffer: list[dict[str, Any]] = []
+        self._cancel_flush: CALLBACK_TYPE | None = None
+        # Time of the last reading buffered and written for each pool
+        self._seen: dict[str, str] = {}
+        self._written: dict[str, str] = {}
+
+    async def async_load(self) -> None:
+        """Load the readings buffered and the times of those exported."""
+        if data := await self._store.async_load():
+            self._written = data["written"]
+            self._buffer = data["buffer"]
+        self._seen = dict(self._written)
+        for row in self._buffer:
+            self._seen[row["pool_id"]] = row["readingTime"]
+
+        if self._format == EXPORT_PARQUET and not (
+            await self.hass.async_add_executor_job(parquet_available)
+        ):
+            _LOGGER.error("Parquet export needs pyarrow, exporting to CSV instead")
+            self._format = EXPORT_CSV
+        writer = (
+            ParquetReadingWriter if self._format == EXPORT_PARQUET else CsvReadingWriter
+        )
+        self._writer = writer(self._directory, self._prefix)
+        if self._buffer:
+            self._schedule_flush()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data of the store."""
+        return {"written": self._written, "buffer": self._buffer}
+
+    @callback
+    def _schedule_flush(self) -> None:
+        """Write out the buffered readings once they are due."""
+        if len(self._buffer) >= self._writer.batch_size:
+            self.hass.async_create_task(self.async_flush())
+        elif self._cancel_flush is None:
+            self._cancel_flush = async_call_later(
+                self.hass, self._writer.flush_interval, self._async_scheduled_flush
+            )
+
+    @callback
+    def async_add(self, pool_id: str, reading: dict[str, Any] | None) -> None:
+        """Buffer a reading unless it was already exported."""
+        if not reading or not reading.get("readingTime"):
+            return
+        if self._seen.get(pool_id) == reading["readingTime"]:
+            return
+        self._seen[pool_id] = reading["readingTime"]
+        self._buffer.append({**reading, "pool_id": pool_id})
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        self._schedule_flush()
+
+    async def _async_scheduled_flush(self, _now) -> None:
+        """Write out the readings held for too long."""
+        self._cancel_flush = None
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """Write out the buffered readings."""
+        if self._cancel_flush:
+            self._cancel_flush()
+            self._cancel_flush = None
+
+        async with self._lock:
+            if not self._buffer:
+                return
+            rows, self._buffer = self._buffer, []
+            try:
+                await self.hass.async_add_executor_job(self._writer.write, rows)
+            except OSError as err:
+                _LOGGER.error(
+                    "Could not export %s Sutro reading(s): %s", len(rows), err
+                )
+                # Kept for the next flush
+                self._buffer[:0] = rows
+                return
+            except (TypeError, ValueError) as err:
+                _LOGGER.error("Could not export malformed Sutro readings: %s", err)
+            else:
+                for row in rows:
+                    self._written[row["pool_id"]] = row["readingTime"]
+            # The files of the rows are complete by now
+            await self._store.async_save(self._data_to_save())
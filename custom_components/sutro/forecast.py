@@ -0,0 +1,108 @@
+"""Depletion forecasting for Sutro consumables."""
+from __future__ import annotations
+
+from datetime import datetime
+from datetime import timedelta
+from typing import Any
+
+# Weight given to the most recent consumption rate when smoothing
+RATE_SMOOTHING = 0.3
+
+
+class DepletionEstimator:
+    """Estimate when a steadily consumed quantity will run out.
+
+    Samples are fed in as they are polled. The consumption rate is derived
+    from the time between successive drops in value and smoothed with an
+    exponentially weighted moving average, so each update is O(1) and no
+    history needs to be kept. An increase larger than ``reset_threshold``
+    (a recharge or a cartridge swap) discards the learned rate.
+    """
+
+    def __init__(self, reset_threshold: float = 0) -> None:
+        """Initialize the estimator."""
+        self._reset_threshold = reset_threshold
+        self._changed_value: float | None = None
+        self._changed_at: datetime | None = None
+        self._seen_drop = False
+        self._rate: float | None = None
+
+    @classmethod
+    def from_dict(
+        cls, data: dict[str, Any], reset_threshold: float = 0
+    ) -> DepletionEstimator:
+        """Return an estimator restored from the result of ``as_dict``."""
+        estimator = cls(reset_threshold)
+        estimator._changed_value = data["changed_value"]
+        estimator._changed_at = data["changed_at"] and datetime.fromisoformat(
+            data["changed_at"]
+        )
+        estimator._seen_drop = data["seen_drop"]
+        estimator._rate = data["rate"]
+        return estimator
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return what the estimator learned, to be restored after a restart."""
+        return {
+            "changed_value": self._changed_value,
+            "changed_at": self._changed_at and self._changed_at.isoformat(),
+            "seen_drop": self._seen_drop,
+            "rate": self._rate,
+        }
+
+    @property
+    def rate(self) -> float | None:
+        """Return the estimated consumption in units per day."""
+        return self._rate
+
+    def reset(self, value: float, when: datetime) -> None:
+        """Forget the learned rate and start over from a new level."""
+        self._changed_value = value
+        self._changed_at = when
+        self._seen_drop = False
+        self._rate = None
+
+    def update(self, value: float | None, when: datetime) -> None:
+        """Feed a new sample into the estimator."""
+        if value is None:
+            return
+        if self._changed_value is None or self._changed_at is None:
+            self.reset(value, when)
+            return
+        if when <= self._changed_at:
+            return
+
+        if value - self._changed_value > self._reset_threshold:
+            self.reset(value, when)
+            return
+
+        if value >= self._changed_value:
+            return
+
+        # The first drop only marks a boundary: the time since we started
+        # watching is not the time since the previous drop.
+        if self._seen_drop:
+            days = (when - self._changed_at).total_seconds() / 86400
+            rate = (self._changed_value - value) / days
+            self._rate = (
+                rate
+                if self._rate is None
+                else RATE_SMOOTHING * rate + (1 - RATE_SMOOTHING) * self._rate
+            )
+        self._seen_drop = True
+        self._changed_value = value
+        self._changed_at = when
+
+    def empty_at(self) -> datetime | None:
+        """Return the estimated time at which the value will reach zero."""
+        if not self._rate or self._changed_value is None or self._changed_at is None:
+            return None
+        days = max(self._changed_value, 0) / self._rate
+        return self._changed_at + timedelta(days=days)
+
+    def days_remaining(self, now: datetime) -> float | None:
+        """Return the estimated number of days left as of ``now``."""
+        empty_at = self.empty_at()
+        if empty_at is None:
+            return None
+        return max((empty_at - now).total_seconds() / 86400, 0.0)
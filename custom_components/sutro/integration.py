@@ -0,0 +1,167 @@
+"""Setup and teardown of the Sutro config entries in Home Assistant."""
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_TOKEN
+from homeassistant.const import Platform
+from homeassistant.core import callback
+from homeassistant.core import CALLBACK_TYPE
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_interval
+
+from .api import SutroDataApiClient
+from .const import CONF_EXPORT_FORMAT
+from .const import CONF_HEARTBEAT_INTERVAL
+from .const import CONF_HEDGE_REQUESTS
+from .const import CONF_RECORD_REQUESTS
+from .const import DEFAULT_HEARTBEAT_INTERVAL
+from .const import DOMAIN
+from .const import EXPORT_NONE
+from .const import MIN_HEARTBEAT_INTERVAL
+from .const import PLATFORM_SECTIONS
+from .const import SERVICE_REFRESH
+from .const import STARTUP_MESSAGE
+from .coordinator import async_remove_forecasts
+from .coordinator import SutroDataUpdateCoordinator
+from .entity import pool_has_entities
+from .export import async_remove_export_state
+from .export import SutroReadingExport
+from .mutations import async_remove_queue
+from .mutations import SutroMutationQueue
+from .recording import ApiRecorder
+from .services import async_setup_services
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up this integration using UI."""
+    if hass.data.get(DOMAIN) is None:
+        hass.data.setdefault(DOMAIN, {})
+        _LOGGER.info(STARTUP_MESSAGE)
+    # Services are shared by the entries and outlive them
+    if not hass.services.has_service(DOMAIN, SERVICE_REFRESH):
+        async_setup_services(hass)
+
+    token: str | None = entry.data.get(CONF_TOKEN)
+
+    if token:
+        session = async_get_clientsession(hass)
+        recorder = None
+        if entry.options.get(CONF_RECORD_REQUESTS, False):
+            recorder = ApiRecorder(
+                hass.config.path(f"{DOMAIN}_recordings"), f"api_{entry.entry_id}"
+            )
+        client = SutroDataApiClient(
+            token, session, entry.options.get(CONF_HEDGE_REQUESTS, False), recorder
+        )
+        mutations = SutroMutationQueue(hass, client, entry.entry_id)
+        await mutations.async_load()
+
+        export = None
+        export_format = entry.options.get(CONF_EXPORT_FORMAT, EXPORT_NONE)
+        if export_format != EXPORT_NONE:
+            export = SutroReadingExport(hass, entry.entry_id, export_format)
+            await export.async_load()
+
+        coordinator = SutroDataUpdateCoordinator(hass, client, mutations, export)
+        await coordinator.async_load_forecasts()
+        await coordinator.async_refresh()
+
+        if not coordinator.last_update_success:
+            raise ConfigEntryNotReady
+
+        hass.data[DOMAIN][entry.entry_id] = coordinator
+
+        if interval := entry.options.get(
+            CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL
+        ):
+            entry.async_on_unload(
+                async_track_time_interval(
+                    hass,
+                    coordinator.async_heartbeat,
+                    # Intervals allowed by earlier versions may be shorter
+                    timedelta(seconds=max(interval, MIN_HEARTBEAT_INTERVAL)),
+                    name=f"{DOMAIN} heartbeat",
+                )
+            )
+
+        # Platforms are only set up once a pool has entities on them
+        coordinator.platforms = _platforms(coordinator.data)
+        await hass.config_entries.async_forward_entry_setups(
+            entry, coordinator.platforms
+        )
+        entry.async_on_unload(
+            coordinator.async_add_listener(
+                _async_forward_new_platforms(hass, entry, coordinator)
+            )
+        )
+
+        entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    return True
+
+
+def _platforms(data: dict) -> set[Platform]:
+    """Return the platforms with entities for the pools of a snapshot."""
+    return {
+        platform
+        for platform, section in PLATFORM_SECTIONS.items()
+        if any(pool_has_entities(pool, section) for pool in data["pools"].values())
+    }
+
+
+def _async_forward_new_platforms(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: SutroDataUpdateCoordinator
+) -> CALLBACK_TYPE:
+    """Return a listener setting up the platforms of features as they appear."""
+    forwarding: set[Platform] = set()
+
+    async def _async_forward(platforms: set[Platform]) -> None:
+        try:
+            await hass.config_entries.async_forward_entry_setups(entry, platforms)
+            coordinator.platforms |= platforms
+        finally:
+            forwarding.difference_update(platforms)
+
+    @callback
+    def _async_forward_new() -> None:
+        new = _platforms(coordinator.data) - coordinator.platforms - forwarding
+        if not new:
+            return
+        forwarding.update(new)
+        # Cancelled rather than awaited if the entry is unloaded meanwhile
+        entry.async_create_background_task(
+            hass, _async_forward(new), f"{DOMAIN} setup of {', '.join(sorted(new))}"
+        )
+
+    return _async_forward_new
+
+
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Handle removal of an entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    unloaded = await hass.config_entries.async_unload_platforms(
+        entry, coordinator.platforms
+    )
+    if unloaded:
+        hass.data[DOMAIN].pop(entry.entry_id)
+
+    return unloaded
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload config entry."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Discard what is stored for a removed entry."""
+    await async_remove_queue(hass, entry.entry_id)
+    await async_remove_export_state(hass, entry.entry_id)
+    await async_remove_forecasts(hass, entry.entry_id)
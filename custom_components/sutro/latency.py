@@ -0,0 +1,75 @@
+"""Latency tracking behind the adaptive timeouts of the Sutro API client."""
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from collections import deque
+
+# Number of recent latencies kept per operation
+WINDOW = 50
+
+# Latencies needed before an operation gets its own timeout
+MIN_SAMPLES = 10
+
+# Timeout as a multiple of the p99 latency of an operation
+TIMEOUT_MULTIPLIER = 3
+
+# Bounds of the adaptive timeouts, in seconds
+MIN_TIMEOUT = 2.0
+MAX_TIMEOUT = 30.0
+
+
+def _percentile(samples: list[float], percentile: float) -> float:
+    """Return a percentile of sorted samples, by the nearest rank."""
+    rank = math.ceil(percentile / 100 * len(samples))
+    return samples[max(rank, 1) - 1]
+
+
+class LatencyTracker:
+    """Keep recent latencies per operation and derive timeouts from them.
+
+    Operations use ``default_timeout`` until they have enough samples. A
+    request that times out is recorded as having taken the whole timeout, so
+    that timeouts grow again when the API gets slower for good.
+    """
+
+    def __init__(self, default_timeout: float) -> None:
+        """Initialize the tracker."""
+        self.default_timeout = default_timeout
+        self._samples: defaultdict[str, deque[float]] = defaultdict(
+            lambda: deque(maxlen=WINDOW)
+        )
+
+    def record(self, operation: str, latency: float) -> None:
+        """Record how long a request of an operation took."""
+        self._samples[operation].append(latency)
+
+    def percentile(self, operation: str, percentile: float) -> float | None:
+        """Return a latency percentile of an operation, if known well enough."""
+        samples = self._samples.get(operation)
+        if not samples or len(samples) < MIN_SAMPLES:
+            return None
+        return _percentile(sorted(samples), percentile)
+
+    def timeout(self, operation: str) -> float:
+        """Return the timeout to use for the next request of an operation."""
+        if (p99 := self.percentile(operation, 99)) is None:
+            return self.default_timeout
+        return min(max(p99 * TIMEOUT_MULTIPLIER, MIN_TIMEOUT), MAX_TIMEOUT)
+
+    def hedge_delay(self, operation: str) -> float | None:
+        """Return how long to wait before hedging a request of an operation."""
+        return self.percentile(operation, 95)
+
+    def summary(self) -> dict[str, dict[str, float | int | None]]:
+        """Return the latency percentiles and timeout of each operation."""
+        return {
+            operation: {
+                "samples": len(samples),
+                "p50": self.percentile(operation, 50),
+                "p95": self.percentile(operation, 95),
+                "p99": self.percentile(operation, 99),
+                "timeout": self.timeout(operation),
+            }
+            for operation, samples in self._samples.items()
+        }
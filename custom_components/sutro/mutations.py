@@ -0,0 +1,108 @@
+"""Durable queue of outbound Sutro mutations."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from itertools import islice
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .api import SutroDataApiClient
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+
+# Maximum number of recommendation updates sent in a single request
+BATCH_SIZE = 10
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+
+def _get_store(hass: HomeAssistant, entry_id: str) -> Store[dict]:
+    """Return the store holding the queue of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.mutations")
+
+
+async def async_remove_queue(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the persisted queue of a config entry."""
+    await _get_store(hass, entry_id).async_remove()
+
+
+class SutroMutationQueue:
+    """Queue of recommendation updates that survives restarts.
+
+    Each pending update maps a recommendation id to the ``completedAt`` value
+    it should be given (``None`` to uncomplete it). A later edit to the same
+    recommendation replaces the earlier one, so only the latest intent is
+    ever sent.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, client: SutroDataApiClient, entry_id: str
+    ) -> None:
+        """Initialize the queue."""
+        self._client = client
+        self._store = _get_store(hass, entry_id)
+        self._lock = asyncio.Lock()
+        self.pending: dict[str, str | None] = {}
+
+    async def async_load(self) -> None:
+        """Load the pending updates persisted by a previous run."""
+        if data := await self._store.async_load():
+            self.pending = data["pending"]
+
+    async def async_enqueue(
+        self, recommendation_id: str, completed_at: str | None
+    ) -> None:
+        """Record an update, superseding any pending one for the same id."""
+        self.pending.pop(recommendation_id, None)
+        self.pending[recommendation_id] = completed_at
+        await self._async_save()
+
+    async def async_flush(self) -> bool:
+        """Send the pending updates in batches.
+
+        Returns False if the API could not be reached, in which case the
+        remaining updates stay queued for a later attempt. When Sutro rejects
+        a whole batch, its updates are sent one at a time so that only the
+        ones it rejects on their own are dropped.
+        """
+        async with self._lock:
+            changed = False
+            reachable = True
+            # Updates left to send one at a time
+            isolated = 0
+            while self.pending:
+                batch = dict(
+                    islice(self.pending.items(), 1 if isolated else BATCH_SIZE)
+                )
+                results = await self._client.async_update_recommendations(batch)
+                if results is None:
+                    reachable = False
+                    break
+                if len(batch) > 1 and not any(results.values()):
+                    isolated = len(batch)
+                    continue
+                isolated = max(isolated - 1, 0)
+
+                for recommendation_id, completed_at in batch.items():
+                    # Leave updates that were superseded while in flight
+                    if self.pending.get(recommendation_id, False) != completed_at:
+                        continue
+                    result = results.get(recommendation_id)
+                    if not result or not result.get("success"):
+                        _LOGGER.warning(
+                            "Dropping rejected update for recommendation %s",
+                            recommendation_id,
+                        )
+                    del self.pending[recommendation_id]
+                    changed = True
+
+            if changed:
+                await self._async_save()
+            return reachable
+
+    async def _async_save(self) -> None:
+        """Persist the pending updates."""
+        await self._store.async_save({"pending": self.pending})
@@ -0,0 +1,110 @@
+"""Profiling of the Sutro refresh and state write path."""
+from __future__ import annotations
+
+import cProfile
+import pstats
+from collections import defaultdict
+from typing import Any
+
+# Number of functions listed in the profile summary
+TOP_HOT_SPOTS = 15
+
+# Number of entities listed in the state write summary
+TOP_STATE_WRITES = 10
+
+
+class _Timing:
+    """Accumulated timing of a repeated operation."""
+
+    __slots__ = ("count", "total", "maximum")
+
+    def __init__(self) -> None:
+        """Initialize the timing."""
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, duration: float) -> None:
+        """Record one run of the operation."""
+        self.count += 1
+        self.total += duration
+        self.maximum = max(self.maximum, duration)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timing in milliseconds."""
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "max_ms": round(self.maximum * 1000, 3),
+        }
+
+
+class SutroProfiler:
+    """Collect a cProfile trace and timings over a few refresh cycles.
+
+    Coordinators and entities only report timings while a profiler is
+    attached to their coordinator, so nothing is measured otherwise.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the profiler."""
+        self._profile = cProfile.Profile()
+        self.cycles: list[float] = []
+        self.phases: defaultdict[str, _Timing] = defaultdict(_Timing)
+        self.state_writes: defaultdict[str, _Timing] = defaultdict(_Timing)
+
+    def enable(self) -> None:
+        """Start collecting the cProfile trace."""
+        self._profile.enable()
+
+    def disable(self) -> None:
+        """Stop collecting the cProfile trace."""
+        self._profile.disable()
+
+    def record_phase(self, phase: str, duration: float) -> None:
+        """Record the duration of a phase of a refresh."""
+        self.phases[phase].add(duration)
+
+    def record_state_write(self, entity_id: str, duration: float) -> None:
+        """Record the time an entity took to write its state."""
+        self.state_writes[entity_id].add(duration)
+
+    def dump_stats(self, path: str) -> None:
+        """Write the cProfile trace to a file loadable with pstats."""
+        self._profile.dump_stats(path)
+
+    def summary(self) -> dict[str, Any]:
+        """Return the hot spots and timings collected so far."""
+        stats = pstats.Stats(self._profile).stats  # type: ignore[attr-defined]
+        hot_spots = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)
+        state_writes = sorted(
+            self.state_writes.items(), key=lambda item: item[1].total, reverse=True
+        )
+        return {
+            "cycles_ms": [round(duration * 1000, 3) for duration in self.cycles],
+            "phases": {
+                phase: timing.as_dict() for phase, timing in self.phases.items()
+            },
+            "state_writes": {
+                "total": sum(timing.count for timing in self.state_writes.values()),
+                "total_ms": round(
+                    sum(timing.total for timing in self.state_writes.values()) * 1000,
+                    3,
+                ),
+                "slowest": {
+                    entity_id: timing.as_dict()
+                    for entity_id, timing in state_writes[:TOP_STATE_WRITES]
+                },
+            },
+            "hot_spots": [
+                {
+                    "function": f"{file}:{line}({name})",
+                    "calls": calls,
+                    "own_ms": round(own * 1000, 3),
+                    "cumulative_ms": round(cumulative * 1000, 3),
+                }
+                for (file, line, name), (_, calls, own, cumulative, _) in hot_spots[
+                    :TOP_HOT_SPOTS
+                ]
+            ],
+        }
@@ -0,0 +1,298 @@
+"""Recording and replay of the requests made to the Sutro API."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import glob
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+
+import aiohttp
+from multidict import CIMultiDict
+from multidict import CIMultiDictProxy
+from yarl import URL
+
+# Uncompressed size of a recording file before it is rotated
+MAX_BYTES = 10 * 1024 * 1024
+
+# Number of rotated recording files kept
+BACKUP_COUNT = 5
+
+# Keys whose values never make it into a recording
+REDACTED_KEYS = {"authorization", "email", "password", "token"}
+REDACTED = "**REDACTED**"
+
+_LOGGER = logging.getLogger(__package__)
+
+
+def redact(value: Any) -> Any:
+    """Return a copy of a request or response without credentials."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key.lower() in REDACTED_KEYS else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+
+def _query_key(method: str, data: Any) -> tuple[str, str]:
+    """Return what identifies a request when it is replayed."""
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except ValueError:
+            return method, data
+    query = data.get("query", "") if isinstance(data, dict) else ""
+    return method, " ".join(query.split())
+
+
+class ApiRecorder:
+    """Append API requests and responses to rotating gzip files.
+
+    Records are queued by the caller and written by a thread of their own,
+    so recording never blocks the event loop. Each line of a file is one
+    JSON record, and the files are flushed after each batch so that the
+    latest one can be read while it is still being written.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        name: str = "api",
+        max_bytes: int = MAX_BYTES,
+        backup_count: int = BACKUP_COUNT,
+    ) -> None:
+        """Initialize the recorder, which starts writing right away."""
+        self.path = os.path.join(directory, f"{name}.jsonl.gz")
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._started = time.monotonic()
+        self._failed = False
+        self._queue: queue.SimpleQueue[dict[str, Any] | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._write, name=f"{name} recorder", daemon=True
+        )
+        self._thread.start()
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        data: Any,
+        operation: str,
+        duration: float,
+        status: int | None,
+        response: Any,
+        error: BaseException | None,
+    ) -> None:
+        """Queue one request and its outcome to be written."""
+        if self._failed:
+            return
+        if isinstance(data, str):
+            with contextlib.suppress(ValueError):
+                data = json.loads(data)
+        self._queue.put(
+            {
+                "time": datetime.now(timezone.utc).isoformat(),
+                "offset": round(time.monotonic() - self._started - duration, 6),
+                "operation": operation,
+                "method": method,
+                "url": url,
+                "request": redact(data),
+                "duration": round(duration, 6),
+                "status": status,
+                "response": redact(response),
+                "error": error
+                and {"type": type(error).__name__, "message": str(error)},
+            }
+        )
+
+    def close(self) -> None:
+        """Write the queued records and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _rotate(self) -> None:
+        """Shift the rotated files by one and rotate the current one."""
+        stem = self.path.removesuffix(".gz")
+        for index in range(self._backup_count - 1, 0, -1):
+            if os.path.exists(source := f"{stem}.{index}.gz"):
+                os.replace(source, f"{stem}.{index + 1}.gz")
+        if self._backup_count:
+            os.replace(self.path, f"{stem}.1.gz")
+        else:
+            os.remove(self.path)
+
+    def _write(self) -> None:
+        """Write queued records until the recorder is closed."""
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # Every run starts a file of its own
+            if os.path.exists(self.path):
+                self._rotate()
+            file = gzip.open(self.path, "wb")
+        except OSError as exception:
+            self._failed = True
+            _LOGGER.error("Could not record Sutro API requests - %s", exception)
+            return
+
+        written = 0
+        try:
+            while (record := self._queue.get()) is not None:
+                batch = [record]
+                while not self._queue.empty():
+                    if (record := self._queue.get()) is None:
+                        break
+                    batch.append(record)
+
+                for item in batch:
+                    line = (json.dumps(item, default=str) + "\n").encode()
+                    if written and written + len(line) > self._max_bytes:
+                        file.close()
+                        self._rotate()
+                        file = gzip.open(self.path, "wb")
+                        written = 0
+                    file.write(line)
+                    written += len(line)
+                file.flush()
+                if record is None:
+                    break
+        except OSError as exception:
+            self._failed = True
+            _LOGGER.error("Could not record Sutro API requests - %s", exception)
+        finally:
+            file.close()
+
+
+def load_recordings(directory: str, name: str = "api") -> list[dict[str, Any]]:
+    """Load the records of a recorder, oldest first."""
+    stem = os.path.join(directory, f"{name}.jsonl")
+    rotated = sorted(
+        glob.glob(f"{glob.escape(stem)}.*.gz"),
+        key=lambda path: int(path.rsplit(".", 2)[1]),
+        reverse=True,
+    )
+    records: list[dict[str, Any]] = []
+    for path in [*rotated, f"{stem}.gz"]:
+        if not os.path.exists(path):
+            continue
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            try:
+                for line in file:
+                    records.append(json.loads(line))
+            except (EOFError, ValueError):
+                # The file still being written ends mid-stream
+                pass
+    return records
+
+
+class ReplayResponse:
+    """Recorded response, with the part of the aiohttp API the client uses."""
+
+    def __init__(self, record: dict[str, Any]) -> None:
+        """Initialize the response."""
+        self._record = record
+        self.status = record["status"] or 200
+
+    def raise_for_status(self) -> None:
+        """Raise the recorded HTTP error, if any."""
+        if self.status >= 400:
+            url = URL(self._record["url"])
+            request_info = aiohttp.RequestInfo(
+                url,
+                self._record["method"].upper(),
+                CIMultiDictProxy(CIMultiDict()),
+                url,
+            )
+            raise aiohttp.ClientResponseError(
+                request_info, (), status=self.status, message="Recorded error"
+            )
+
+    async def json(self) -> Any:
+        """Return the recorded body."""
+        error = self._record["error"]
+        if error and error["type"] in ("KeyError", "TypeError", "ValueError"):
+            raise ValueError(error["message"])
+        return self._record["response"]
+
+
+class ReplaySession:
+    """Stand-in for an aiohttp session that answers from recordings.
+
+    Requests are matched to recordings by method and query, ignoring the
+    variables, and get the recorded responses of that query in their
+    original order, starting over once they run out. Each answer takes the
+    recorded duration divided by ``speed``, or no time at all with a speed
+    of 0. Recorded failures are raised again.
+    """
+
+    def __init__(self, records: list[dict[str, Any]], speed: float = 1.0) -> None:
+        """Initialize the session."""
+        self.speed = speed
+        self.requests = 0
+        self._records: defaultdict[tuple[str, str], list[dict[str, Any]]] = defaultdict(
+            list
+        )
+        self._next: defaultdict[tuple[str, str], int] = defaultdict(int)
+        for record in records:
+            self._records[_query_key(record["method"], record["request"])].append(
+                record
+            )
+
+    @classmethod
+    def from_directory(
+        cls, directory: str, name: str = "api", speed: float = 1.0
+    ) -> ReplaySession:
+        """Create a session replaying the recordings of a directory."""
+        return cls(load_recordings(directory, name), speed)
+
+    async def _request(self, method: str, data: Any) -> ReplayResponse:
+        """Answer a request with the next recording of its query."""
+        self.requests += 1
+        key = _query_key(method, data)
+        if not (records := self._records.get(key)):
+            raise aiohttp.ClientError("No recording of this request")
+        record = records[self._next[key] % len(records)]
+        self._next[key] += 1
+
+        if self.speed:
+            await asyncio.sleep(record["duration"] / self.speed)
+        error = record["error"]
+        if error and error["type"] == "TimeoutError":
+            raise asyncio.TimeoutError
+        if error and record["status"] is None:
+            raise aiohttp.ClientError(error["message"])
+        return ReplayResponse(record)
+
+    async def get(self, url: str, headers: dict | None = None) -> ReplayResponse:
+        """Replay a GET request."""
+        return await self._request("get", None)
+
+    async def post(
+        self, url: str, headers: dict | None = None, data: Any = None
+    ) -> ReplayResponse:
+        """Replay a POST request."""
+        return await self._request("post", data)
+
+    async def put(
+        self, url: str, headers: dict | None = None, data: Any = None
+    ) -> ReplayResponse:
+        """Replay a PUT request."""
+        return await self._request("put", data)
+
+    async def patch(
+        self, url: str, headers: dict | None = None, data: Any = None
+    ) -> ReplayResponse:
+        """Replay a PATCH request."""
+        return await self._request("patch", data)
@@ -6,9 +6,11 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONCENTRATION_PARTS_PER_MILLION
 from homeassistant.const import PERCENTAGE
 from homeassistant.const import UnitOfTemperature
+from homeassistant.const import UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
 from .const import ICON_ACIDITY
@@ -18,8 +20,10 @@ from .const import ICON_CHARGER
 from .const import ICON_CHARGES
 from .const import ICON_CHLORINE
 from .const import ICON_HEALTH
+from .const import ICON_TIMER
 from .const import ICON_WIFI
 from .const import NAME
+from .entity import async_add_pool_entities
 from .entity import SutroEntity
 
 
@@ -28,20 +32,30 @@ async def async_setup_entry(
 ) -> None:
     """Set up the sensors for the Sutro integration."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities(
-        [
-            AciditySensor(coordinator, entry),
-            AlkalinitySensor(coordinator, entry),
-            FreeChlorineSensor(coordinator, entry),
-            TemperatureSensor(coordinator, entry),
-            BatterySensor(coordinator, entry),
-            CartridgeCharges(coordinator, entry),
-            BromineSensor(coordinator, entry),
-            DeviceHealthSensor(coordinator, entry),
-            HubChargerStatusSensor(coordinator, entry),
-            HubWifiSSIDSensor(coordinator, entry),
-        ]
-    )
+    async_add_pool_entities(coordinator, entry, async_add_entities, _create_sensors)
+
+
+def _create_sensors(coordinator, entry: ConfigEntry, pool_id: str) -> list:
+    """Create the sensors of a pool."""
+    return [
+        AciditySensor(coordinator, entry, pool_id),
+        AlkalinitySensor(coordinator, entry, pool_id),
+        FreeChlorineSensor(coordinator, entry, pool_id),
+        TemperatureSensor(coordinator, entry, pool_id),
+        BatterySensor(coordinator, entry, pool_id),
+        CartridgeCharges(coordinator, entry, pool_id),
+        CartridgeDaysRemainingSensor(coordinator, entry, pool_id),
+        CartridgeEmptyAtSensor(coordinator, entry, pool_id),
+        BatteryDaysRemainingSensor(coordinator, entry, pool_id),
+        BatteryEmptyAtSensor(coordinator, entry, pool_id),
+        BromineSensor(coordinator, entry, pool_id),
+        DeviceHealthSensor(coordinator, entry, pool_id),
+        HubChargerStatusSensor(coordinator, entry, pool_id),
+        HubWifiSSIDSensor(coordinator, entry, pool_id),
+        DeviceLastMessageSensor(coordinator, entry, pool_id),
+        HubLastMessageSensor(coordinator, entry, pool_id),
+        LastReadingSensor(coordinator, entry, pool_id),
+    ]
 
 
 class SutroSensor(SutroEntity, SensorEntity):
@@ -53,32 +67,77 @@ class SutroSensor(SutroEntity, SensorEntity):
 class SutroDeviceSensor(SutroSensor):
     """Base class for Sutro Device Sensors."""
 
-    @property
-    def extra_state_attributes(self):
-        """Return a dictionary containing the last message."""
-        return {"last_message": self.coordinator.data["me"]["device"]["lastMessage"]}
+    _section = "device"
 
 
 class SutroDeviceReadingSensor(SutroDeviceSensor):
     """Base class for Sutro Device Reading Sensors."""
 
+    _section = "latestReading"
+
+
+class SutroForecastSensor(SutroDeviceSensor):
+    """Base class for Sutro depletion forecast sensors."""
+
+    _attr_icon = ICON_TIMER
+
+    # Coordinator attribute holding the depletion estimators of the pools
+    _forecasts: str
+
+    @property
+    def forecast(self):
+        """Return the depletion estimator backing this sensor."""
+        return getattr(self.coordinator, self._forecasts)[self.pool_id]
+
+
+class SutroDaysRemainingSensor(SutroForecastSensor):
+    """Base class for Sutro depletion forecast sensors in days."""
+
+    _attr_native_unit_of_measurement = UnitOfTime.DAYS
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_suggested_display_precision = 1
+
+    @property
+    def native_value(self):
+        """Return the estimated number of days remaining."""
+        days = self.forecast.days_remaining(dt_util.utcnow())
+        # Rounded so that the state does not change on every poll
+        return days and round(days, 1)
+
+
+class SutroEmptyAtSensor(SutroForecastSensor):
+    """Base class for Sutro depletion forecast sensors as a timestamp."""
+
+    _attr_state_class = None
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+
     @property
-    def extra_state_attributes(self):
-        """Return a dictionary containing the latest reading."""
-        return super().extra_state_attributes | {
-            "reading_time": self.coordinator.data["me"]["pool"]["latestReading"][
-                "readingTime"
-            ],
-        }
+    def native_value(self):
+        """Return the estimated time at which the consumable runs out."""
+        return self.forecast.empty_at()
+
+
+class SutroTimestampSensor(SutroSensor):
+    """Base class for Sutro diagnostic timestamp sensors."""
+
+    _attr_state_class = None
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    # Field of the section holding the timestamp, as sent by the API
+    _key: str
+
+    @property
+    def native_value(self):
+        """Return the parsed timestamp."""
+        timestamp = self.pool[self._section][self._key]
+        return timestamp and dt_util.parse_datetime(timestamp)
 
 
 class SutroHubSensor(SutroSensor):
     """Base class for Sutro Hub Sensors."""
 
-    @property
-    def extra_state_attributes(self):
-        """Return a dictionary containing the last message."""
-        return {"last_message": self.coordinator.data["me"]["hub"]["lastMessage"]}
+    _section = "hub"
 
 
 class AciditySensor(SutroDeviceReadingSensor):
@@ -91,13 +150,13 @@ class AciditySensor(SutroDeviceReadingSensor):
     @property
     def native_value(self):
         """Return the native value of the sensor."""
-        val = self.coordinator.data["me"]["pool"]["latestReading"]["ph"]
+        val = self.pool["latestReading"]["ph"]
         return val and float(val)
 
     @property
     def unique_id(self):
         """Return a unique ID to use for the sensor."""
-        return f"{self.coordinator.data['me']['device']['serialNumber']}-acidity"
+        return f"{self.serial_number}-acidity"
 
 
 class AlkalinitySensor(SutroDeviceReadingSensor):
@@ -110,13 +169,13 @@ class AlkalinitySensor(SutroDeviceReadingSensor):
     @property
     def native_value(self):
         """Return the native value of the sensor."""
-        val = self.coordinator.data["me"]["pool"]["latestReading"]["alkalinity"]
+        val = self.pool["latestReading"]["alkalinity"]
         return val and float(val)
 
     @property
     def unique_id(self):
         """Return a unique ID to use for the sensor."""
-        return f"{self.coordinator.data['me']['device']['serialNumber']}-alkalinity"
+        return f"{self.serial_number}-alkalinity"
 
 
 class FreeChlorineSensor(SutroDeviceReadingSensor):
@@ -129,13 +188,13 @@ class FreeChlorineSensor(SutroDeviceReadingSensor):
     @property
     def native_value(self):
         """Return the native value of the sensor."""
-        val = self.coordinator.data["me"]["pool"]["latestReading"]["chlorine"]
+        val = self.pool["latestReading"]["chlorine"]
         return val and float(val)
 
     @property
     def unique_id(self):
         """Return a unique ID to use for the sensor."""
-        return f"{self.coordinator.data['me']['device']['serialNumber']}-chlorine"
+        return f"{self.serial_number}-chlorine"
 
 
 class BromineSensor(SutroDeviceReadingSensor):
@@ -148,13 +207,13 @@ class BromineSensor(SutroDeviceReadingSensor):
     @property
     def native_value(self):
         """Return the native value of the sensor."""
-        val = self.coordinator.data["me"]["pool"]["latestReading"]["bromine"]
+        val = self.pool["latestReading"]["bromine"]
         return val and float(val)
 
     @property
     def unique_id(self):
         """Return a unique ID to use for the sensor."""
-        return f"{self.coordinator.data['me']['device']['serialNumber']}-bromine"
+        return f"{self.serial_number}-bromine"
 
 
 class TemperatureSensor(SutroDeviceSensor):
@@ -167,13 +226,13 @@ class TemperatureSensor(SutroDeviceSensor):
     @property
     def native_value(self):
         """Return the native value of the sensor."""
-        val = self.coordinator.data["me"]["device"]["temperature"]
+        val = self.pool["device"]["temperature"]
         return val and float(val)
 
     @property
     def unique_id(self):
         """Return a unique ID to use for the sensor."""
-        return f"{self.coordinator.data['me']['device']['serialNumber']}-temperature"
+        return f"{self.serial_number}-temperature"
 
 
 class BatterySensor(SutroDeviceSensor):
@@ -186,13 +245,13 @@ class BatterySensor(SutroDeviceSensor):
     @property
     def native_value(self):
         """Return the native value of the sensor."""
-        val = self.coordinator.data["me"]["device"]["batteryLevel"]
+        val = self.pool["device"]["batteryLevel"]
         return val and float(val)
 
     @property
     def unique_id(self):
         """Return a unique ID to use for the sensor."""
-        return f"{self.coordinator.data['me']['device']['serialNumber']}-battery"
+        return f"{self.serial_number}-battery"
 
 
 class CartridgeCharges(SutroDeviceSensor):
@@ -205,13 +264,61 @@ class CartridgeCharges(SutroDeviceSensor):
     @property
     def native_value(self):
         """Return the native value of the sensor."""
-        val = self.coordinator.data["me"]["device"]["cartridgeCharges"]
+        val = self.pool["device"]["cartridgeCharges"]
         return val and int(val)
 
     @property
     def unique_id(self):
         """Return a unique ID to use for the sensor."""
-        return f"{self.coordinator.data['me']['device']['serialNumber']}-charges"
+        return f"{self.serial_number}-charges"
+
+
+class CartridgeDaysRemainingSensor(SutroDaysRemainingSensor):
+    """Representation of a Cartridge Days Remaining Sensor."""
+
+    _forecasts = "cartridge_forecasts"
+    _attr_name = f"{NAME} Cartridge Days Remaining"
+
+    @property
+    def unique_id(self):
+        """Return a unique ID to use for the sensor."""
+        return f"{self.serial_number}-charges-days-remaining"
+
+
+class CartridgeEmptyAtSensor(SutroEmptyAtSensor):
+    """Representation of a Cartridge Estimated Empty At Sensor."""
+
+    _forecasts = "cartridge_forecasts"
+    _attr_name = f"{NAME} Cartridge Estimated Empty"
+
+    @property
+    def unique_id(self):
+        """Return a unique ID to use for the sensor."""
+        return f"{self.serial_number}-charges-empty-at"
+
+
+class BatteryDaysRemainingSensor(SutroDaysRemainingSensor):
+    """Representation of a Battery Days Remaining Sensor."""
+
+    _forecasts = "battery_forecasts"
+    _attr_name = f"{NAME} Battery Days Remaining"
+
+    @property
+    def unique_id(self):
+        """Return a unique ID to use for the sensor."""
+        return f"{self.serial_number}-battery-days-remaining"
+
+
+class BatteryEmptyAtSensor(SutroEmptyAtSensor):
+    """Representation of a Battery Estimated Empty At Sensor."""
+
+    _forecasts = "battery_forecasts"
+    _attr_name = f"{NAME} Battery Estimated Empty"
+
+    @property
+    def unique_id(self):
+        """Return a unique ID to use for the sensor."""
+        return f"{self.serial_number}-battery-empty-at"
 
 
 class DeviceHealthSensor(SutroDeviceSensor):
@@ -225,12 +332,12 @@ class DeviceHealthSensor(SutroDeviceSensor):
     @property
     def native_value(self):
         """Return the native value of the sensor."""
-        return self.coordinator.data["me"]["device"]["health"]
+        return self.pool["device"]["health"]
 
     @property
     def unique_id(self):
         """Return a unique ID to use for the sensor."""
-        return f"{self.coordinator.data['me']['device']['serialNumber']}-health"
+        return f"{self.serial_number}-health"
 
 
 class HubChargerStatusSensor(SutroHubSensor):
@@ -244,12 +351,12 @@ class HubChargerStatusSensor(SutroHubSensor):
     @property
     def native_value(self):
         """Return the native value of the sensor."""
-        return self.coordinator.data["me"]["hub"]["chargerStatus"]
+        return self.pool["hub"]["chargerStatus"]
 
     @property
     def unique_id(self):
         """Return a unique ID to use for the sensor."""
-        return f"{self.coordinator.data['me']['device']['serialNumber']}-charger-status"
+        return f"{self.serial_number}-charger-status"
 
 
 class HubWifiSSIDSensor(SutroHubSensor):
@@ -263,9 +370,48 @@ class HubWifiSSIDSensor(SutroHubSensor):
     @property
     def native_value(self):
         """Return the native value of the sensor."""
-        return self.coordinator.data["me"]["hub"]["ssid"]
+        return self.pool["hub"]["ssid"]
+
+    @property
+    def unique_id(self):
+        """Return a unique ID to use for the sensor."""
+        return f"{self.serial_number}-hub-ssid"
+
+
+class DeviceLastMessageSensor(SutroTimestampSensor):
+    """Representation of a Device Last Message Sensor."""
+
+    _section = "device"
+    _key = "lastMessage"
+    _attr_name = f"{NAME} Device Last Message"
+
+    @property
+    def unique_id(self):
+        """Return a unique ID to use for the sensor."""
+        return f"{self.serial_number}-last-message"
+
+
+class HubLastMessageSensor(SutroTimestampSensor):
+    """Representation of a Hub Last Message Sensor."""
+
+    _section = "hub"
+    _key = "lastMessage"
+    _attr_name = f"{NAME} Hub Last Message"
+
+    @property
+    def unique_id(self):
+        """Return a unique ID to use for the sensor."""
+        return f"{self.serial_number}-hub-last-message"
+
+
+class LastReadingSensor(SutroTimestampSensor):
+    """Representation of a Last Reading Sensor."""
+
+    _section = "latestReading"
+    _key = "readingTime"
+    _attr_name = f"{NAME} Last Reading"
 
     @property
     def unique_id(self):
         """Return a unique ID to use for the sensor."""
-        return f"{self.coordinator.data['me']['device']['serialNumber']}-hub-ssid"
+        return f"{self.serial_number}-reading-time"
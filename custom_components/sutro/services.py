@@ -0,0 +1,117 @@
+"""Services for Sutro."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant
+from homeassistant.core import ServiceCall
+from homeassistant.core import ServiceResponse
+from homeassistant.core import SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .api import DATA_FIELDS
+from .const import ATTR_CONFIG_ENTRY_ID
+from .const import ATTR_CYCLES
+from .const import ATTR_FIELDS
+from .const import DOMAIN
+from .const import SERVICE_PROFILE
+from .const import SERVICE_REFRESH
+from .profiler import SutroProfiler
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=10)
+        ),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_FIELDS): vol.All(
+            cv.ensure_list, vol.Length(min=1), [vol.In(DATA_FIELDS)]
+        ),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+
+def _get_coordinators(hass: HomeAssistant, call: ServiceCall) -> list:
+    """Return the coordinators targeted by a service call."""
+    coordinators = hass.data.get(DOMAIN, {})
+    if ATTR_CONFIG_ENTRY_ID not in call.data:
+        return list(coordinators.values())
+    if (coordinator := coordinators.get(call.data[ATTR_CONFIG_ENTRY_ID])) is None:
+        raise HomeAssistantError(
+            f"No loaded Sutro entry with id {call.data[ATTR_CONFIG_ENTRY_ID]}"
+        )
+    return [coordinator]
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Sutro services."""
+    profile_lock = asyncio.Lock()
+
+    async def async_refresh(call: ServiceCall) -> None:
+        """Fetch the selected groups of fields right away."""
+        coordinators = _get_coordinators(hass, call)
+        try:
+            await asyncio.gather(
+                *(
+                    coordinator.async_refresh_fields(call.data[ATTR_FIELDS])
+                    for coordinator in coordinators
+                )
+            )
+        except UpdateFailed as err:
+            raise HomeAssistantError(f"Could not refresh Sutro data: {err}") from err
+
+    async def async_profile(call: ServiceCall) -> ServiceResponse:
+        """Profile the next refresh cycles and return the hot spots."""
+        if profile_lock.locked():
+            raise HomeAssistantError("A Sutro profile is already running")
+        coordinators = _get_coordinators(hass, call)
+
+        async with profile_lock:
+            profiler = SutroProfiler()
+            try:
+                profiler.enable()
+            except ValueError as err:
+                raise HomeAssistantError(f"Cannot start profiling: {err}") from err
+
+            for coordinator in coordinators:
+                coordinator.profiler = profiler
+            try:
+                for _ in range(call.data[ATTR_CYCLES]):
+                    started = time.perf_counter()
+                    await asyncio.gather(
+                        *(coordinator.async_refresh() for coordinator in coordinators)
+                    )
+                    profiler.cycles.append(time.perf_counter() - started)
+            finally:
+                profiler.disable()
+                for coordinator in coordinators:
+                    coordinator.profiler = None
+
+            path = hass.config.path(
+                f"{DOMAIN}_profile_{dt_util.utcnow():%Y%m%d_%H%M%S}.prof"
+            )
+            await hass.async_add_executor_job(profiler.dump_stats, path)
+            summary = await hass.async_add_executor_job(profiler.summary)
+            return {"stats_file": path, **summary}
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH, async_refresh, schema=REFRESH_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
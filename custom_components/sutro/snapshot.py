@@ -0,0 +1,142 @@
+"""Validation of partial Sutro GraphQL responses."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+# Sections of each pool that fail independently
+SECTIONS = ("device", "hub", "latestReading", "latestRecommendations")
+
+# Sections served under the ``pool`` of the ``me`` query, the others are
+# served under ``me`` itself
+POOL_SECTIONS = ("latestReading", "latestRecommendations")
+
+# Sections covered by each group of fields of the API client
+FIELD_SECTIONS: dict[str, tuple[str, ...]] = {
+    "device": ("device",),
+    "hub": ("hub",),
+    "connectivity": ("device", "hub"),
+    "recommendations": ("latestRecommendations",),
+    "readings": ("latestReading",),
+}
+
+# Groups of fields fetching only part of their sections, which leave the rest
+# of those sections as old as it was
+PARTIAL_FIELDS = frozenset({"connectivity"})
+
+
+def _pool_errors(error: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return an error of the ``me`` query with its path into ``pools``."""
+    path = list(error.get("path") or ())
+    if path[:1] != ["me"] or len(path) < 2:
+        return [error]
+    if path[1] in ("device", "hub"):
+        return [{**error, "path": ["me", "pools", 0, *path[1:]]}]
+    if path[1] != "pool":
+        return [error]
+    if len(path) > 2 and path[2] in POOL_SECTIONS:
+        return [{**error, "path": ["me", "pools", 0, *path[2:]]}]
+    # The pool itself failed, and with it every section under it
+    return [{**error, "path": ["me", "pools", 0, section]} for section in POOL_SECTIONS]
+
+
+def account_pools(
+    me: dict[str, Any], errors: list[dict[str, Any]] | None
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Return the pool of a ``me`` result as a ``pools`` list, with its errors.
+
+    The API serves the device and hub of an account under ``me`` and the rest
+    under its one ``pool``. They are gathered into a single pool keyed by the
+    account id, and the paths of the errors are rewritten to point into it.
+    """
+    errors = [
+        pool_error for error in errors or [] for pool_error in _pool_errors(error)
+    ]
+    if not me.get("id"):
+        return [], errors
+
+    pool_data = me.get("pool") or {}
+    pool = {"id": me["id"]}
+    if pool_data.get("type") is not None:
+        pool["type"] = pool_data["type"]
+    for section in SECTIONS:
+        pool[section] = (pool_data if section in POOL_SECTIONS else me).get(section)
+    return [pool], errors
+
+
+def errored_sections(
+    errors: list[dict[str, Any]] | None, pool_ids: list[str | None]
+) -> set[tuple[str, str]]:
+    """Return the sections affected by the errors of a GraphQL response.
+
+    ``pool_ids`` holds the id of the pool at each index of the ``pools``
+    list. Sections are returned as ``(pool id, section)`` pairs. Errors that
+    cannot be tied to a known pool affect none, the sections they left null
+    are failed by ``merge_pools`` anyway.
+    """
+    failed: set[tuple[str, str]] = set()
+    for error in errors or []:
+        path = list(error.get("path") or ())
+        if path[:2] != ["me", "pools"] or len(path) < 3:
+            continue
+        index = path[2]
+        if not isinstance(index, int) or index >= len(pool_ids):
+            continue
+        if (pool_id := pool_ids[index]) is None:
+            continue
+        if len(path) > 3 and path[3] in SECTIONS:
+            failed.add((pool_id, path[3]))
+        else:
+            failed.update((pool_id, section) for section in SECTIONS)
+    return failed
+
+
+def merge_pools(
+    previous: dict[str, dict[str, Any]] | None,
+    pools: list[dict[str, Any] | None],
+    errors: list[dict[str, Any]] | None,
+    sections: Iterable[str] = SECTIONS,
+) -> tuple[dict[str, dict[str, Any]], set[tuple[str, str]]]:
+    """Merge a possibly partial ``pools`` result with the last good one.
+
+    Only ``sections`` are expected in ``pools``, the others are taken from
+    ``previous`` as they are. The fields of a returned section are laid over
+    its previous value, and every expected section that came back null or
+    errored keeps its value from ``previous``. Pools missing from the result
+    are kept as they were, with their expected sections failed.
+
+    Returns the merged pools keyed by id and the ``(pool id, section)`` pairs
+    of the expected sections that failed.
+    """
+    previous = previous or {}
+    expected = set(sections)
+    pool_ids = [pool and pool.get("id") for pool in pools]
+    failed = {
+        (pool_id, section)
+        for pool_id, section in errored_sections(errors, pool_ids)
+        if section in expected
+    }
+
+    merged: dict[str, dict[str, Any]] = {}
+    for pool in pools:
+        if not pool or not pool.get("id"):
+            continue
+        pool_id = pool["id"]
+        last = previous.get(pool_id) or {}
+        merged_pool = {**last, **pool}
+        for section in SECTIONS:
+            value = pool.get(section)
+            if section not in expected:
+                value = last.get(section)
+            elif (pool_id, section) not in failed and value is not None:
+                value = {**(last.get(section) or {}), **value}
+            else:
+                failed.add((pool_id, section))
+                value = last.get(section)
+            merged_pool[section] = value
+        merged[pool_id] = merged_pool
+
+    for pool_id in previous.keys() - merged.keys():
+        merged[pool_id] = previous[pool_id]
+        failed.update((pool_id, section) for section in expected)
+    return merged, failed
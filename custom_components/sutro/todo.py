@@ -4,10 +4,13 @@ from homeassistant.components.todo import TodoItemStatus
 from homeassistant.components.todo import TodoListEntity
 from homeassistant.components.todo import TodoListEntityFeature
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
+from .const import PLATFORM_SECTIONS
+from .entity import async_add_pool_entities
 from .entity import SutroEntity
 
 
@@ -19,25 +22,48 @@ async def async_setup_entry(
     """Set up the todo list for the Sutro integration."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities([RecommendationsList(coordinator, entry)])
+    async_add_pool_entities(
+        coordinator,
+        entry,
+        async_add_entities,
+        _create_lists,
+        PLATFORM_SECTIONS[Platform.TODO],
+    )
+
+
+def _create_lists(coordinator, entry: ConfigEntry, pool_id: str) -> list:
+    """Create the todo lists of a pool."""
+    return [RecommendationsList(coordinator, entry, pool_id)]
 
 
 class RecommendationsList(SutroEntity, TodoListEntity):
     """Representation of a Recommendations Todo List."""
 
     _attr_has_entity_name = True
+    _section = "latestRecommendations"
+    _unrecorded_attributes = frozenset({"pending_sync"})
     _attr_supported_features = TodoListEntityFeature.UPDATE_TODO_ITEM
 
-    def __init__(self, coordinator, entry) -> None:
+    def __init__(self, coordinator, entry, pool_id) -> None:
         """Initialize RecommendationsList."""
-        super().__init__(coordinator=coordinator, config_entry=entry)
+        super().__init__(coordinator=coordinator, config_entry=entry, pool_id=pool_id)
         self._attr_name = "Recommendations"
 
     @property
     def unique_id(self):
         """Return a unique ID to use for the list."""
-        return (
-            f"{self.coordinator.data['me']['device']['serialNumber']}-recommendations"
+        return f"{self.serial_number}-recommendations"
+
+    @property
+    def available(self):
+        """Return whether the recommendations are recent enough to be shown.
+
+        Unlike other entities, the list stays available while refreshes fail,
+        so that the updates queued meanwhile can be seen.
+        """
+        pools = self.coordinator.data["pools"]
+        return self.pool_id in pools and self.coordinator.section_available(
+            self.pool_id, self._section
         )
 
     @property
@@ -46,13 +72,16 @@ class RecommendationsList(SutroEntity, TodoListEntity):
         if self.coordinator.data is None:
             return None
         else:
+            pending = self.coordinator.mutations.pending
             items = []
-            for recommendation in self.coordinator.data["me"]["pool"][
-                "latestRecommendations"
-            ]["recommendations"]:
+            for recommendation in self.pool["latestRecommendations"]["recommendations"]:
+                # Show queued updates as if they had already been applied
+                completed_at = pending.get(
+                    recommendation["id"], recommendation["completedAt"]
+                )
                 recommendation_status = (
                     TodoItemStatus.NEEDS_ACTION
-                    if recommendation["completedAt"] is None
+                    if completed_at is None
                     else TodoItemStatus.COMPLETED
                 )
                 items.append(
@@ -66,10 +95,21 @@ class RecommendationsList(SutroEntity, TodoListEntity):
 
             return items
 
+    @property
+    def extra_state_attributes(self):
+        """Return the recommendations with updates not yet synced to Sutro."""
+        latest = self.pool["latestRecommendations"] or {}
+        ids = {item["id"] for item in latest.get("recommendations") or []}
+        return {
+            "pending_sync": [
+                recommendation_id
+                for recommendation_id in self.coordinator.mutations.pending
+                if recommendation_id in ids
+            ]
+        }
+
     async def async_update_todo_item(self, item: TodoItem) -> None:
         """Update an item to the To-do list."""
-        if item.status == TodoItemStatus.COMPLETED:
-            await self.coordinator.api.async_complete_recommendation(item.uid)
-        else:
-            await self.coordinator.api.async_uncomplete_recommendation(item.uid)
-        await self.coordinator.async_refresh()
+        await self.coordinator.async_update_recommendation(
+            item.uid, item.status == TodoItemStatus.COMPLETED
+        )
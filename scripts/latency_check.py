@@ -0,0 +1,105 @@
+"""Check the adaptive timeouts and hedged reads of the Sutro API client.
+
+Fetches the data of one account ``--requests`` times in a row from a local
+stub of the Sutro API that delays every ``--spike-every``-th request by
+``--spike-latency`` seconds, once without and once with hedging, and prints
+a JSON report with, for each run:
+
+- failed fetches,
+- fetch latency percentiles,
+- requests received by the stub,
+- the latencies and timeout the client settled on.
+
+Run it from the repository root with the integration requirements
+installed::
+
+    python scripts/latency_check.py --requests 200 --spike-every 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+import aiohttp
+from loadtest import percentiles
+from stub_server import StubServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def async_run_client(
+    url: str, requests: int, hedge: bool
+) -> tuple[int, list[float], dict]:
+    """Fetch the data repeatedly and return failures, latencies and timeouts."""
+    sys.path.insert(0, REPO_ROOT)
+    # pylint: disable=import-outside-toplevel
+    from custom_components.sutro import api
+
+    api.SUTRO_GRAPHSQL_URL = url
+    failed = 0
+    latencies: list[float] = []
+    async with aiohttp.ClientSession() as session:
+        client = api.SutroDataApiClient("latency-check", session, hedge=hedge)
+        for _ in range(requests):
+            started = time.perf_counter()
+            if await client.async_get_data() is None:
+                failed += 1
+            latencies.append(time.perf_counter() - started)
+        return failed, latencies, client.latency.summary()
+
+
+async def async_run(
+    requests: int, latency: float, spike_every: int, spike_latency: float
+) -> dict:
+    """Run the check without and with hedging and return its report."""
+    report: dict = {
+        "parameters": {
+            "requests": requests,
+            "stub_latency_ms": latency * 1000,
+            "spike_every": spike_every,
+            "spike_latency_ms": spike_latency * 1000,
+        }
+    }
+    for hedge in (False, True):
+        stub = StubServer(latency, spike_every=spike_every, spike_latency=spike_latency)
+        url = stub.start()
+        try:
+            failed, latencies, timeouts = await async_run_client(url, requests, hedge)
+        finally:
+            stub.stop()
+        report["hedged" if hedge else "unhedged"] = {
+            "failed_fetches": failed,
+            "fetch_latency": percentiles(latencies),
+            "stub_requests": stub.requests,
+            "operations": timeouts,
+        }
+    return report
+
+
+def main() -> None:
+    """Parse the command line and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="stub latency in seconds"
+    )
+    parser.add_argument("--spike-every", type=int, default=20)
+    parser.add_argument(
+        "--spike-latency", type=float, default=5, help="spike latency in seconds"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    report = asyncio.run(
+        async_run(args.requests, args.latency, args.spike_every, args.spike_latency)
+    )
+    print(json.dumps(report, indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Measure how Home Assistant copes with many Sutro config entries.
+
+Sets up a bare Home Assistant instance with ``--entries`` Sutro config entries
+that talk to a local stub of the Sutro API, then drives ``--cycles`` refreshes
+of every coordinator at once and prints a JSON report with:
+
+- event loop lag while refreshing,
+- refresh latency percentiles,
+- memory allocated per config entry during setup,
+- state writes per second while refreshing.
+
+The stub answers deterministically, so two runs with the same arguments do
+the same work and their reports can be compared. Run it from the repository
+root with Home Assistant installed::
+
+    python scripts/loadtest.py --entries 200 --cycles 10
+
+With ``--replay``, the entry is answered from a recording of the integration
+instead, at ``--speed`` times the recorded latency. A recording belongs to
+one account, so it is replayed to a single entry::
+
+    python scripts/loadtest.py --replay sutro_recordings/api_<entry id>.jsonl.gz
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from stub_server import StubServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Interval at which the event loop lag is sampled, in seconds
+LAG_SAMPLE_INTERVAL = 0.01
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """Return the p50, p95 and p99 of a list of durations in milliseconds."""
+    if len(values) < 2:
+        values = values * 2 or [0.0, 0.0]
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+        "max_ms": round(max(values) * 1000, 3),
+    }
+
+
+async def _sample_lag(samples: list[float], stop: asyncio.Event) -> None:
+    """Record how late the event loop wakes up from short sleeps."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+        samples.append(max(loop.time() - started - LAG_SAMPLE_INTERVAL, 0))
+
+
+async def async_setup_hass(config_dir: str):
+    """Create a Home Assistant instance able to load the Sutro integration."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant import bootstrap
+    from homeassistant import config_entries
+    from homeassistant import core
+    from homeassistant import loader
+
+    os.symlink(
+        os.path.join(REPO_ROOT, "custom_components"),
+        os.path.join(config_dir, "custom_components"),
+    )
+    sys.path.insert(0, config_dir)
+
+    hass = core.HomeAssistant(config_dir)
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await loader.async_get_custom_components(hass)
+    await bootstrap.async_load_base_functionality(hass)
+    # The todo platform only needs http for its panel, which is not measured
+    hass.config.components.add("http")
+    hass.set_state(core.CoreState.running)
+    return hass
+
+
+def create_entry(index: int):
+    """Return a Sutro config entry for the n-th stub account."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.const import CONF_TOKEN
+
+    return ConfigEntry(
+        data={CONF_TOKEN: f"loadtest-{index}"},
+        domain="sutro",
+        minor_version=1,
+        options={},
+        source="user",
+        title=f"Load test {index}",
+        unique_id=None,
+        version=1,
+    )
+
+
+async def async_run(
+    entries: int,
+    cycles: int,
+    latency: float,
+    replay: str | None = None,
+    speed: float = 1.0,
+) -> dict:
+    """Run the load test and return its report."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.const import EVENT_STATE_CHANGED
+    from homeassistant.core import callback
+
+    stub = None
+    if not replay:
+        stub = StubServer(latency)
+        url = stub.start()
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_setup_hass(config_dir)
+
+        from custom_components.sutro import api
+        from custom_components.sutro import integration
+        from custom_components.sutro.const import DOMAIN
+        from custom_components.sutro.recording import ReplaySession
+
+        if replay:
+            directory, name = os.path.split(replay)
+            session = await hass.async_add_executor_job(
+                ReplaySession.from_directory,
+                directory,
+                name.removesuffix(".jsonl.gz"),
+                speed,
+            )
+            integration.async_get_clientsession = lambda _hass: session
+        else:
+            api.SUTRO_GRAPHSQL_URL = url
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        setup_started = time.perf_counter()
+        for index in range(entries):
+            await hass.config_entries.async_add(create_entry(index))
+        await hass.async_block_till_done()
+        setup_duration = time.perf_counter() - setup_started
+        memory = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+
+        coordinators = list(hass.data[DOMAIN].values())
+        state_writes = 0
+
+        @callback
+        def _count_state_write(_event) -> None:
+            nonlocal state_writes
+            state_writes += 1
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, _count_state_write)
+
+        async def _timed_refresh(coordinator) -> float:
+            started = time.perf_counter()
+            await coordinator.async_refresh()
+            return time.perf_counter() - started
+
+        lag: list[float] = []
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(_sample_lag(lag, stop))
+        refresh: list[float] = []
+        cycles_started = time.perf_counter()
+        for _ in range(cycles):
+            refresh += await asyncio.gather(
+                *(_timed_refresh(coordinator) for coordinator in coordinators)
+            )
+            await hass.async_block_till_done()
+        cycles_duration = time.perf_counter() - cycles_started
+        stop.set()
+        await sampler
+
+        failed = sum(
+            not coordinator.last_update_success for coordinator in coordinators
+        )
+        await hass.async_stop(force=True)
+    if stub:
+        stub.stop()
+
+    return {
+        "parameters": {
+            "entries": entries,
+            "cycles": cycles,
+            "stub_latency_ms": latency * 1000,
+            "replay": replay,
+            "replay_speed": speed,
+        },
+        "setup_seconds": round(setup_duration, 3),
+        "loaded_entries": len(coordinators),
+        "failed_refreshes": failed,
+        "event_loop_lag": percentiles(lag),
+        "refresh_latency": percentiles(refresh),
+        "memory_per_entry_kib": round(memory / max(len(coordinators), 1) / 1024, 1),
+        "state_writes": state_writes,
+        "state_writes_per_second": round(state_writes / cycles_duration, 1),
+        "stub_requests": stub.requests if stub else session.requests,
+    }
+
+
+def main() -> None:
+    """Parse the command line and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=200)
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="stub latency in seconds"
+    )
+    parser.add_argument("--replay", help="recording to answer from instead")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="replay speed, 0 for no latency"
+    )
+    parser.add_argument("--output", help="also write the report to this file")
+    args = parser.parse_args()
+    if args.replay:
+        args.entries = 1
+
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(
+        async_run(
+            args.entries,
+            args.cycles,
+            args.latency,
+            args.replay,
+            args.speed,
+        )
+    )
+    text = json.dumps(report, indent=2)
+    print(text)  # noqa: T201
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
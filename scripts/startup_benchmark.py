@@ -0,0 +1,184 @@
+"""Measure how fast the Sutro integration starts.
+
+Prints a JSON report with:
+
+- the import time of the package, the command line, the Home Assistant side
+  of the integration and each platform, each in a fresh interpreter that has
+  already imported the core of Home Assistant, as it would have,
+- the time from adding each of ``--entries`` config entries at once, like
+  Home Assistant does on start, to the first state written for it,
+- the platforms set up and the entities created.
+
+The entries talk to the local stub of the Sutro API used by the load test.
+Pass ``--no-recommendations`` for accounts without recommendations, which
+do not need the todo platform. Run it from the repository root with Home
+Assistant installed::
+
+    python scripts/startup_benchmark.py --entries 50 --no-recommendations
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from loadtest import async_setup_hass
+from loadtest import create_entry
+from loadtest import percentiles
+from stub_server import StubServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules Home Assistant has imported before it loads any integration
+HA_CORE_MODULES = (
+    "homeassistant.config_entries",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.update_coordinator",
+)
+
+# Modules whose import time is reported, in the order they are imported
+INTEGRATION_MODULES = (
+    "custom_components.sutro",
+    "custom_components.sutro.integration",
+    "custom_components.sutro.sensor",
+    "custom_components.sutro.binary_sensor",
+    "custom_components.sutro.todo",
+)
+
+CLI_MODULE = "custom_components.sutro.__main__"
+
+
+def import_times(preload: tuple[str, ...], modules: tuple[str, ...]) -> dict:
+    """Return the import time of modules in a fresh interpreter, in ms.
+
+    The time of a module includes the modules it is the first to import, so
+    the modules shared by several of them count toward the first one only.
+    """
+    code = ";".join(f"import {module}" for module in (*preload, *modules))
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        cwd=REPO_ROOT,
+        text=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line.split("|")
+        if (name := name.strip()) in modules:
+            times[name] = round(int(cumulative) / 1000, 1)
+    return times
+
+
+async def async_time_to_first_state(
+    entries: int, latency: float, recommendations: bool
+) -> dict:
+    """Add the entries at once and return how long their first state took."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.const import EVENT_STATE_CHANGED
+    from homeassistant.core import callback
+    from homeassistant.helpers import entity_registry as er
+
+    stub = StubServer(latency, recommendations=recommendations)
+    url = stub.start()
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_setup_hass(config_dir)
+
+        from custom_components.sutro import api
+        from custom_components.sutro.const import DOMAIN
+
+        api.SUTRO_GRAPHSQL_URL = url
+        registry = er.async_get(hass)
+        first_state: dict[str, float] = {}
+
+        @callback
+        def _record_first_state(event) -> None:
+            entity = registry.async_get(event.data["entity_id"])
+            if entity and entity.config_entry_id not in first_state:
+                first_state[entity.config_entry_id] = time.perf_counter()
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, _record_first_state)
+
+        config_entries = [create_entry(index) for index in range(entries)]
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(hass.config_entries.async_add(entry) for entry in config_entries)
+        )
+        await hass.async_block_till_done()
+        setup_duration = time.perf_counter() - started
+
+        coordinators = list(hass.data[DOMAIN].values())
+        platforms = sorted(
+            {
+                platform
+                for coordinator in coordinators
+                for platform in coordinator.platforms
+            }
+        )
+        entities = len(registry.entities)
+        await hass.async_stop(force=True)
+    stub.stop()
+
+    return {
+        "setup_seconds": round(setup_duration, 3),
+        "loaded_entries": len(coordinators),
+        "time_to_first_state": percentiles(
+            [
+                first_state[entry.entry_id] - started
+                for entry in config_entries
+                if entry.entry_id in first_state
+            ]
+        ),
+        "entries_without_state": sum(
+            entry.entry_id not in first_state for entry in config_entries
+        ),
+        "platforms": platforms,
+        "entities": entities,
+    }
+
+
+def main() -> None:
+    """Parse the command line and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=50)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="stub latency in seconds"
+    )
+    parser.add_argument(
+        "--no-recommendations",
+        dest="recommendations",
+        action="store_false",
+        help="give the accounts no recommendations",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    sys.path.insert(0, REPO_ROOT)
+    report = {
+        "parameters": {
+            "entries": args.entries,
+            "stub_latency_ms": args.latency * 1000,
+            "recommendations": args.recommendations,
+        },
+        "import_ms": {
+            **import_times(HA_CORE_MODULES, INTEGRATION_MODULES),
+            **import_times((), (CLI_MODULE,)),
+        },
+        **asyncio.run(
+            async_time_to_first_state(args.entries, args.latency, args.recommendations)
+        ),
+    }
+    print(json.dumps(report, indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
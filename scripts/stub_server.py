@@ -0,0 +1,179 @@
+"""Local stand-in for the Sutro GraphQL API used by the development scripts.
+
+Every bearer token is its own account. The data of an account only depends on
+the token and on how many times it has been fetched, so runs with the same
+arguments see the same sequence of responses.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+from aiohttp import web
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# Simulated time between two fetches of the same account
+POLL_STEP = timedelta(minutes=30)
+
+# Number of fetches between two new readings
+READING_EVERY = 2
+
+
+def _seed(token: str) -> int:
+    """Return a stable number derived from a token."""
+    return int.from_bytes(hashlib.sha256(token.encode()).digest()[:4], "big")
+
+
+def reading(seed: int, index: int) -> dict:
+    """Return the n-th reading of an account."""
+    return {
+        "alkalinity": 80 + (seed + index) % 40,
+        "bromine": 0,
+        "chlorine": 1 + (seed + index) % 4,
+        "ph": 7.2 + ((seed + index) % 6) / 10,
+        "readingTime": (EPOCH + index * READING_EVERY * POLL_STEP).isoformat(),
+    }
+
+
+def account_data(token: str, fetch: int, recommendations: bool = True) -> dict:
+    """Return the ``me`` data of an account for its n-th fetch."""
+    seed = _seed(token)
+    now = EPOCH + fetch * POLL_STEP
+    latest = fetch // READING_EVERY
+    account = {
+        "id": f"user-{seed}",
+        "firstName": "Load",
+        "device": {
+            "batteryLevel": max(100 - fetch // 4, 0),
+            "serialNumber": f"SUTRO{seed:010d}",
+            "temperature": 78 + (seed + fetch) % 5,
+            "cartridgeCharges": max(60 - fetch // 6, 0),
+            "health": "good",
+            "coreStatus": True,
+            "lidOpen": False,
+            "online": True,
+            "shouldTakeReadings": True,
+            "lastMessage": now.isoformat(),
+            "currentFirmwareVersion": "1.0.0",
+        },
+        "hub": {
+            "online": True,
+            "chargerStatus": "charging",
+            "ssid": "stub",
+            "lastMessage": now.isoformat(),
+        },
+        "pool": {
+            "type": "pool" if seed % 2 else "spa",
+            "latestRecommendations": {
+                "conflictWarning": None,
+                "recommendations": [
+                    {
+                        "id": f"rec-{seed}-{latest}",
+                        "chemical": None,
+                        "completedAt": None,
+                        "expiredAt": None,
+                        "type": "chlorine",
+                        "decision": "add",
+                        "explanation": "Free chlorine is low.",
+                        "treatment": "Add 1 lb of chlorine",
+                    }
+                ],
+            },
+            "latestReading": reading(seed, latest),
+        },
+    }
+    if not recommendations:
+        account["pool"]["latestRecommendations"] = None
+    return account
+
+
+class StubServer:
+    """Sutro GraphQL stub running on its own thread and event loop.
+
+    Running apart from the loop under test keeps the stub from adding to the
+    event loop lag being measured.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0,
+        spike_every: int = 0,
+        spike_latency: float = 0,
+        recommendations: bool = True,
+    ) -> None:
+        """Initialize the stub with a fixed latency in seconds per request.
+
+        With ``spike_every``, every n-th request takes ``spike_latency``
+        seconds instead, like a slow connection would. Without
+        ``recommendations``, accounts have none, like the ones that never
+        used them.
+        """
+        self.latency = latency
+        self.spike_every = spike_every
+        self.spike_latency = spike_latency
+        self.recommendations = recommendations
+        self.requests = 0
+        self.url = ""
+        self._fetches: dict[str, int] = {}
+        self._loop = asyncio.new_event_loop()
+        self._runner: web.AppRunner | None = None
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        """Answer a GraphQL request."""
+        self.requests += 1
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        payload = await request.json()
+        latency = self.latency
+        if self.spike_every and self.requests % self.spike_every == 0:
+            latency = self.spike_latency
+        if latency:
+            await asyncio.sleep(latency)
+
+        variables = payload.get("variables") or {}
+        if "completeRecommendation" in payload["query"]:
+            # Batched updates alias mutation n as mn, with $idn and $completedAtn
+            data = {
+                f"m{key[2:]}": {
+                    "completedAt": variables.get(f"completedAt{key[2:]}"),
+                    "success": True,
+                }
+                for key in variables
+                if key.startswith("id")
+            }
+        else:
+            fetch = self._fetches.get(token, 0)
+            self._fetches[token] = fetch + 1
+            data = {"me": account_data(token, fetch, self.recommendations)}
+        return web.json_response({"data": data})
+
+    async def _start(self) -> None:
+        """Start serving on a free local port."""
+        app = web.Application()
+        app.router.add_post("/graphql", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}/graphql"
+
+    def start(self) -> str:
+        """Start the stub and return the URL of its GraphQL endpoint."""
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self.url
+
+    def stop(self) -> None:
+        """Stop the stub."""
+        if self._runner:
+            asyncio.run_coroutine_threadsafe(
+                self._runner.cleanup(), self._loop
+            ).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
@@ -0,0 +1,21 @@
+"""Helpers for the tests of the Sutro integration."""
+from __future__ import annotations
+
+import tempfile
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from homeassistant import core
+from homeassistant.helpers import device_registry as dr
+
+
+@asynccontextmanager
+async def async_test_hass() -> AsyncIterator[core.HomeAssistant]:
+    """Return a bare Home Assistant instance with a temporary config dir."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = core.HomeAssistant(config_dir)
+        await dr.async_load(hass)
+        try:
+            yield hass
+        finally:
+            await hass.async_stop(force=True)
@@ -0,0 +1,138 @@
+"""Tests for the data update coordinator of the Sutro integration."""
+import asyncio
+from datetime import timedelta
+
+from custom_components.sutro.coordinator import SutroDataUpdateCoordinator
+from homeassistant.core import callback
+
+from .common import async_test_hass
+
+ACCOUNT_ID = "user-1"
+
+
+def _me(ph: float) -> dict:
+    """Return a full ``me`` result with a reading of the given pH."""
+    return {
+        "id": ACCOUNT_ID,
+        "firstName": "Test",
+        "device": {
+            "batteryLevel": 90,
+            "serialNumber": "SUTRO1",
+            "temperature": 80,
+            "cartridgeCharges": 20,
+            "health": "good",
+            "coreStatus": True,
+            "lidOpen": False,
+            "online": True,
+            "shouldTakeReadings": True,
+            "lastMessage": "2024-01-01T00:00:00+00:00",
+            "currentFirmwareVersion": "1.0",
+        },
+        "hub": {
+            "online": True,
+            "chargerStatus": "charging",
+            "ssid": "home",
+            "lastMessage": "2024-01-01T00:00:00+00:00",
+        },
+        "pool": {
+            "type": "pool",
+            "latestReading": {
+                "alkalinity": 100,
+                "bromine": 0,
+                "chlorine": 2,
+                "ph": ph,
+                "readingTime": f"2024-01-01T00:00:{int(ph * 10) % 60:02}+00:00",
+            },
+            "latestRecommendations": {
+                "conflictWarning": None,
+                "recommendations": [],
+            },
+        },
+    }
+
+
+class _Client:
+    """API client answering every query with the same account."""
+
+    def __init__(self) -> None:
+        self.ph = 7.0
+        self.queries: list[list[str]] = []
+
+    async def async_get_data(self, fields=None) -> dict:
+        self.queries.append(sorted(fields or ()))
+        return {"data": {"me": _me(self.ph)}}
+
+
+class _Mutations:
+    """Mutation queue without pending updates."""
+
+    pending: dict = {}
+
+
+def test_partial_refresh_leaves_full_polls_scheduled():
+    """Refreshing a few fields neither moves nor cancels the next full poll."""
+
+    async def _async_test() -> None:
+        async with async_test_hass() as hass:
+            client = _Client()
+            coordinator = SutroDataUpdateCoordinator(hass, client, _Mutations())
+            updates = []
+            coordinator.async_add_listener(callback(lambda: updates.append(True)))
+            await coordinator.async_refresh()
+            # The timer handle of the next full poll
+            scheduled = coordinator._unsub_refresh.__self__
+
+            client.ph = 7.5
+            coordinator.last_update_success = False
+            await coordinator.async_refresh_fields(["readings"])
+
+            assert coordinator._unsub_refresh.__self__ is scheduled
+            assert not scheduled.cancelled()
+            assert not coordinator.last_update_success
+            assert client.queries[-1] == ["readings"]
+            pool = coordinator.data["pools"][ACCOUNT_ID]
+            assert pool["latestReading"]["ph"] == 7.5
+            assert pool["device"]["serialNumber"] == "SUTRO1"
+            assert len(updates) == 2
+
+    asyncio.run(_async_test())
+
+
+class _UnreachableMutations:
+    """Mutation queue with an update Sutro cannot be reached for."""
+
+    def __init__(self) -> None:
+        self.pending = {"rec-0": None}
+        self.flushes = 0
+
+    async def async_flush(self) -> bool:
+        self.flushes += 1
+        return False
+
+
+def test_mutation_retries_back_off_without_polling():
+    """Queued updates are retried on their own, less and less often."""
+
+    async def _async_test() -> None:
+        async with async_test_hass() as hass:
+            client = _Client()
+            mutations = _UnreachableMutations()
+            coordinator = SutroDataUpdateCoordinator(hass, client, mutations)
+            await coordinator.async_refresh()
+            assert mutations.flushes == 1
+            assert coordinator._cancel_mutation_retry is not None
+            queries = len(client.queries)
+
+            intervals = []
+            for _ in range(6):
+                intervals.append(coordinator._mutation_retry_interval)
+                await coordinator._async_retry_mutations(None)
+
+            assert mutations.flushes == 7
+            assert len(client.queries) == queries
+            assert intervals == [
+                timedelta(minutes=minutes) for minutes in (2, 4, 8, 16, 16, 16)
+            ]
+            coordinator._cancel_mutation_retry()
+
+    asyncio.run(_async_test())
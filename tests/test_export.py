@@ -0,0 +1,93 @@
+"""Tests for the export of Sutro readings to local files."""
+import asyncio
+import csv
+import os
+
+from custom_components.sutro.const import EXPORT_CSV
+from custom_components.sutro.export import CsvReadingWriter
+from custom_components.sutro.export import SutroReadingExport
+
+from .common import async_test_hass
+
+
+def _reading(hour: int) -> dict:
+    """Return a reading taken at an hour of the first day of 2024."""
+    return {
+        "alkalinity": 100,
+        "bromine": 0,
+        "chlorine": 2,
+        "ph": 7.4,
+        "readingTime": f"2024-01-01T{hour:02}:00:00+00:00",
+    }
+
+
+def _exported(hass) -> list[dict]:
+    """Return the rows of the January 2024 export of the test entry."""
+    path = hass.config.path("sutro_export", "readings_entry_2024-01.csv")
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8", newline="") as file:
+        return list(csv.DictReader(file))
+
+
+class _FailingWriter(CsvReadingWriter):
+    """CSV writer failing its first write, like a full disk would."""
+
+    failures = 1
+
+    def write(self, rows) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise OSError("No space left on device")
+        super().write(rows)
+
+
+def test_readings_are_exported_once():
+    """A reading seen again, even after a restart, is not exported again."""
+
+    async def _async_test() -> None:
+        async with async_test_hass() as hass:
+            export = SutroReadingExport(hass, "entry", EXPORT_CSV)
+            await export.async_load()
+            export.async_add("pool", _reading(0))
+            export.async_add("pool", _reading(0))
+            export.async_add("pool", _reading(1))
+            export.async_add("pool", None)
+            await export.async_flush()
+
+            restarted = SutroReadingExport(hass, "entry", EXPORT_CSV)
+            await restarted.async_load()
+            restarted.async_add("pool", _reading(1))
+            restarted.async_add("pool", _reading(2))
+            await restarted.async_flush()
+
+            assert [row["readingTime"] for row in _exported(hass)] == [
+                _reading(hour)["readingTime"] for hour in range(3)
+            ]
+
+    asyncio.run(_async_test())
+
+
+def test_readings_are_kept_when_writing_fails():
+    """Readings that could not be written are written by the next flush."""
+
+    async def _async_test() -> None:
+        async with async_test_hass() as hass:
+            export = SutroReadingExport(hass, "entry", EXPORT_CSV)
+            await export.async_load()
+            export._writer = _FailingWriter(
+                hass.config.path("sutro_export"), "readings_entry"
+            )
+            export.async_add("pool", _reading(0))
+            await export.async_flush()
+
+            assert not _exported(hass)
+
+            export.async_add("pool", _reading(1))
+            await export.async_flush()
+
+            assert [row["readingTime"] for row in _exported(hass)] == [
+                _reading(hour)["readingTime"] for hour in range(2)
+            ]
+
+    asyncio.run(_async_test())
@@ -0,0 +1,89 @@
+"""Tests for the depletion forecasting of Sutro consumables."""
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+from custom_components.sutro.forecast import DepletionEstimator
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _feed(estimator, *samples):
+    """Feed ``(days since START, value)`` samples into an estimator."""
+    for days, value in samples:
+        estimator.update(value, START + timedelta(days=days))
+
+
+def test_first_drop_only_marks_a_boundary():
+    """The time before the first drop says nothing of the rate."""
+    estimator = DepletionEstimator()
+    _feed(estimator, (0, 100), (5, 90))
+
+    assert estimator.rate is None
+    assert estimator.empty_at() is None
+    assert estimator.days_remaining(START) is None
+
+
+def test_rate_from_successive_drops():
+    """The rate is the drop over the time between two drops."""
+    estimator = DepletionEstimator()
+    _feed(estimator, (0, 100), (1, 90), (2, 90), (3, 80))
+
+    assert estimator.rate == 5
+    assert estimator.empty_at() == START + timedelta(days=3 + 80 / 5)
+    assert estimator.days_remaining(START + timedelta(days=3)) == 16
+
+
+def test_rate_is_smoothed():
+    """A new rate only moves the estimate part of the way."""
+    estimator = DepletionEstimator()
+    _feed(estimator, (0, 100), (1, 90), (2, 80), (3, 60))
+
+    assert estimator.rate == 0.3 * 20 + 0.7 * 10
+
+
+def test_recharge_resets_the_rate():
+    """An increase above the threshold starts over."""
+    estimator = DepletionEstimator(reset_threshold=5)
+    _feed(estimator, (0, 100), (1, 90), (2, 80), (3, 83))
+
+    assert estimator.rate == 10
+
+    _feed(estimator, (4, 100))
+
+    assert estimator.rate is None
+
+
+def test_ignores_unknown_and_out_of_order_samples():
+    """Missing values and samples older than the last change are skipped."""
+    estimator = DepletionEstimator()
+    _feed(estimator, (0, 100), (1, None), (1, 90), (0.5, 50), (2, 80))
+
+    assert estimator.rate == 10
+
+
+def test_days_remaining_never_negative():
+    """Past the estimated empty time, no days remain."""
+    estimator = DepletionEstimator()
+    _feed(estimator, (0, 100), (1, 90), (2, 80))
+
+    assert estimator.days_remaining(START + timedelta(days=30)) == 0
+
+
+def test_restored_from_dict():
+    """An estimator restored from its dict goes on where it left off."""
+    estimator = DepletionEstimator(reset_threshold=5)
+    _feed(estimator, (0, 100), (1, 90), (2, 80))
+
+    restored = DepletionEstimator.from_dict(estimator.as_dict(), 5)
+    _feed(restored, (3, 70))
+
+    assert restored.rate == 10
+    assert restored.empty_at() == estimator.empty_at()
+
+
+def test_new_estimator_round_trips():
+    """An estimator that saw nothing yet can be saved and restored."""
+    restored = DepletionEstimator.from_dict(DepletionEstimator().as_dict())
+
+    assert restored.as_dict() == DepletionEstimator().as_dict()
@@ -0,0 +1,67 @@
+"""Tests for the latency tracking of the Sutro API client."""
+from custom_components.sutro.latency import LatencyTracker
+from custom_components.sutro.latency import MAX_TIMEOUT
+from custom_components.sutro.latency import MIN_SAMPLES
+from custom_components.sutro.latency import MIN_TIMEOUT
+from custom_components.sutro.latency import TIMEOUT_MULTIPLIER
+from custom_components.sutro.latency import WINDOW
+
+
+def test_default_timeout_until_enough_samples():
+    """Operations without enough samples use the default timeout."""
+    tracker = LatencyTracker(10)
+    for _ in range(MIN_SAMPLES - 1):
+        tracker.record("data", 1.0)
+
+    assert tracker.timeout("data") == 10
+    assert tracker.hedge_delay("data") is None
+    assert tracker.timeout("login") == 10
+
+
+def test_timeout_from_p99():
+    """The timeout is a multiple of the p99 latency, hedging starts at p95."""
+    tracker = LatencyTracker(10)
+    for latency in range(WINDOW, 0, -1):
+        tracker.record("data", latency / 10)
+
+    assert tracker.percentile("data", 99) == 5.0
+    assert tracker.timeout("data") == 5.0 * TIMEOUT_MULTIPLIER
+    assert tracker.hedge_delay("data") == 4.8
+
+
+def test_timeout_bounds():
+    """Timeouts stay within their bounds."""
+    tracker = LatencyTracker(10)
+    for _ in range(MIN_SAMPLES):
+        tracker.record("fast", 0.01)
+        tracker.record("slow", MAX_TIMEOUT)
+        tracker.record("usual", 1.0)
+
+    assert tracker.timeout("fast") == MIN_TIMEOUT
+    assert tracker.timeout("slow") == MAX_TIMEOUT
+    assert tracker.timeout("usual") == 1.0 * TIMEOUT_MULTIPLIER
+
+
+def test_window_forgets_old_samples():
+    """Only the latest samples count toward the percentiles."""
+    tracker = LatencyTracker(10)
+    for _ in range(WINDOW):
+        tracker.record("data", 5.0)
+    for _ in range(WINDOW):
+        tracker.record("data", 0.1)
+
+    assert tracker.percentile("data", 99) == 0.1
+
+
+def test_operations_are_tracked_apart():
+    """Each operation has latencies and a timeout of its own."""
+    tracker = LatencyTracker(10)
+    for _ in range(MIN_SAMPLES):
+        tracker.record("data", 1.0)
+        tracker.record("mutation", 2.0)
+
+    summary = tracker.summary()
+
+    assert summary["data"]["timeout"] == 3.0
+    assert summary["mutation"]["timeout"] == 6.0
+    assert summary["data"]["samples"] == MIN_SAMPLES
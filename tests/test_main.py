@@ -0,0 +1,32 @@
+"""Tests for the command line checking Sutro accounts."""
+import pytest
+from custom_components.sutro.__main__ import parse_accounts
+
+
+def test_parse_accounts():
+    """Tokens and JSON accounts are read, blank and comment lines skipped."""
+    lines = [
+        "token-1\n",
+        "\n",
+        "# a comment\n",
+        '{"email": "a@b.c", "password": "secret"}\n',
+        '{"name": "spa", "token": "token-2"}',
+    ]
+
+    assert parse_accounts(lines) == [
+        {"name": "line 1", "token": "token-1"},
+        {"name": "a@b.c", "email": "a@b.c", "password": "secret"},
+        {"name": "spa", "token": "token-2"},
+    ]
+
+
+def test_parse_accounts_with_invalid_json():
+    """A line that is not valid JSON is reported by its number."""
+    with pytest.raises(ValueError, match="line 2 is not valid JSON"):
+        parse_accounts(["token-1", "{not json"])
+
+
+def test_parse_accounts_without_credentials():
+    """A JSON account needs a token, or an e-mail and a password."""
+    with pytest.raises(ValueError, match="line 1 has no token"):
+        parse_accounts(['{"email": "a@b.c"}'])
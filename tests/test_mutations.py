@@ -0,0 +1,179 @@
+"""Tests for the durable queue of Sutro recommendation updates."""
+import asyncio
+
+from custom_components.sutro.mutations import BATCH_SIZE
+from custom_components.sutro.mutations import SutroMutationQueue
+
+from .common import async_test_hass
+
+
+class _Client:
+    """API client accepting every update but those of ``rejected`` ids.
+
+    Batches holding an id of ``invalid`` are rejected as a whole, as Sutro
+    does with documents it cannot validate.
+    """
+
+    def __init__(self, rejected=(), invalid=()) -> None:
+        self.rejected = set(rejected)
+        self.invalid = set(invalid)
+        self.reachable = True
+        self.batches: list[dict] = []
+
+    async def async_update_recommendations(self, changes: dict) -> dict | None:
+        self.batches.append(dict(changes))
+        if not self.reachable:
+            return None
+        if self.invalid & changes.keys():
+            return dict.fromkeys(changes)
+        return {
+            recommendation_id: {
+                "completedAt": completed_at,
+                "success": recommendation_id not in self.rejected,
+            }
+            for recommendation_id, completed_at in changes.items()
+        }
+
+
+def test_rejected_document_is_split():
+    """A batch rejected as a whole only drops the updates rejected alone."""
+
+    async def _async_test() -> None:
+        async with async_test_hass() as hass:
+            client = _Client(invalid={"rec-2"})
+            queue = SutroMutationQueue(hass, client, "entry")
+            for index in range(4):
+                await queue.async_enqueue(f"rec-{index}", None)
+
+            assert await queue.async_flush()
+
+            assert not queue.pending
+            assert [list(batch) for batch in client.batches] == [
+                ["rec-0", "rec-1", "rec-2", "rec-3"],
+                ["rec-0"],
+                ["rec-1"],
+                ["rec-2"],
+                ["rec-3"],
+            ]
+
+    asyncio.run(_async_test())
+
+
+def test_unreachable_api_keeps_updates():
+    """Updates stay queued while Sutro cannot be reached."""
+
+    async def _async_test() -> None:
+        async with async_test_hass() as hass:
+            client = _Client()
+            client.reachable = False
+            queue = SutroMutationQueue(hass, client, "entry")
+            await queue.async_enqueue("rec-0", None)
+
+            assert not await queue.async_flush()
+
+            assert queue.pending == {"rec-0": None}
+            assert len(client.batches) == 1
+
+    asyncio.run(_async_test())
+
+
+def test_later_edit_replaces_earlier_one():
+    """Only the latest update of a recommendation is sent."""
+
+    async def _async_test() -> None:
+        async with async_test_hass() as hass:
+            client = _Client()
+            queue = SutroMutationQueue(hass, client, "entry")
+            await queue.async_enqueue("rec-0", "2024-01-01T00:00:00+00:00")
+            await queue.async_enqueue("rec-1", None)
+            await queue.async_enqueue("rec-0", None)
+
+            assert list(queue.pending.items()) == [("rec-1", None), ("rec-0", None)]
+            assert await queue.async_flush()
+            assert client.batches == [{"rec-1": None, "rec-0": None}]
+
+    asyncio.run(_async_test())
+
+
+def test_edit_while_in_flight_is_kept():
+    """An update made while an earlier one is sent is sent after it."""
+
+    async def _async_test() -> None:
+        async with async_test_hass() as hass:
+            client = _Client()
+            queue = SutroMutationQueue(hass, client, "entry")
+            send = client.async_update_recommendations
+
+            async def _async_send_and_edit(changes: dict) -> dict | None:
+                if len(client.batches) == 0:
+                    await queue.async_enqueue("rec-0", None)
+                return await send(changes)
+
+            client.async_update_recommendations = _async_send_and_edit
+            await queue.async_enqueue("rec-0", "2024-01-01T00:00:00+00:00")
+
+            assert await queue.async_flush()
+
+            assert client.batches == [
+                {"rec-0": "2024-01-01T00:00:00+00:00"},
+                {"rec-0": None},
+            ]
+            assert not queue.pending
+
+    asyncio.run(_async_test())
+
+
+def test_updates_are_sent_in_batches():
+    """No request holds more than BATCH_SIZE updates."""
+
+    async def _async_test() -> None:
+        async with async_test_hass() as hass:
+            client = _Client()
+            queue = SutroMutationQueue(hass, client, "entry")
+            for index in range(BATCH_SIZE * 2 + 1):
+                await queue.async_enqueue(f"rec-{index}", None)
+
+            assert await queue.async_flush()
+
+            assert [len(batch) for batch in client.batches] == [
+                BATCH_SIZE,
+                BATCH_SIZE,
+                1,
+            ]
+            assert not queue.pending
+
+    asyncio.run(_async_test())
+
+
+def test_unsuccessful_update_is_dropped():
+    """An update Sutro answers without success is not sent again."""
+
+    async def _async_test() -> None:
+        async with async_test_hass() as hass:
+            client = _Client(rejected={"rec-1"})
+            queue = SutroMutationQueue(hass, client, "entry")
+            for index in range(3):
+                await queue.async_enqueue(f"rec-{index}", None)
+
+            assert await queue.async_flush()
+
+            assert not queue.pending
+            assert len(client.batches) == 1
+
+    asyncio.run(_async_test())
+
+
+def test_queue_survives_restarts():
+    """Pending updates are loaded back by a new queue."""
+
+    async def _async_test() -> None:
+        async with async_test_hass() as hass:
+            client = _Client()
+            await SutroMutationQueue(hass, client, "entry").async_enqueue("rec-0", None)
+
+            queue = SutroMutationQueue(hass, client, "entry")
+            await queue.async_load()
+
+            assert queue.pending == {"rec-0": None}
+
+    asyncio.run(_async_test())
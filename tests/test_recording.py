@@ -0,0 +1,117 @@
+"""Tests for the recording and replay of Sutro API requests."""
+import asyncio
+import json
+import tempfile
+
+import aiohttp
+import pytest
+from custom_components.sutro.recording import ApiRecorder
+from custom_components.sutro.recording import load_recordings
+from custom_components.sutro.recording import redact
+from custom_components.sutro.recording import REDACTED
+from custom_components.sutro.recording import ReplaySession
+
+QUERY = "{ me { id } }"
+
+
+def _record(response: dict, query: str = QUERY, **record) -> dict:
+    """Return a recording of a successful POST of a query."""
+    return {
+        "method": "post",
+        "url": "https://api.mysutro.com/graphql",
+        "request": {"query": query},
+        "duration": 0.5,
+        "status": 200,
+        "response": response,
+        "error": None,
+        **record,
+    }
+
+
+def test_redact():
+    """Credentials are redacted at any depth, whatever their case."""
+    value = {
+        "Authorization": "Bearer secret",
+        "variables": {"email": "a@b.c", "password": "hunter2"},
+        "data": {"login": [{"token": "secret", "firstName": "Ann"}]},
+    }
+
+    assert redact(value) == {
+        "Authorization": REDACTED,
+        "variables": {"email": REDACTED, "password": REDACTED},
+        "data": {"login": [{"token": REDACTED, "firstName": "Ann"}]},
+    }
+    assert value["variables"]["password"] == "hunter2"
+
+
+def test_recorder_writes_redacted_records():
+    """Recorded requests are loaded back without their credentials."""
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = ApiRecorder(directory)
+        recorder.record(
+            "post",
+            "https://api.mysutro.com/graphql",
+            json.dumps({"query": QUERY, "variables": {"password": "hunter2"}}),
+            "login",
+            0.1,
+            200,
+            {"data": {"login": {"token": "secret"}}},
+            None,
+        )
+        recorder.close()
+
+        (record,) = load_recordings(directory)
+
+    assert record["request"]["variables"]["password"] == REDACTED
+    assert record["response"]["data"]["login"]["token"] == REDACTED
+    assert record["operation"] == "login"
+
+
+def test_replay_matches_queries_in_order():
+    """Requests get the responses of their query in order, then start over."""
+    session = ReplaySession(
+        [
+            _record({"data": 1}),
+            _record({"data": "other"}, query="{ me { firstName } }"),
+            _record({"data": 2}),
+        ],
+        speed=0,
+    )
+
+    async def _async_replay(query: str) -> dict:
+        # Whitespace and variables do not count toward the match
+        data = json.dumps({"query": f"  {query}\n", "variables": {"limit": 1}})
+        response = await session.post("https://api.mysutro.com/graphql", data=data)
+        return await response.json()
+
+    async def _async_test() -> list:
+        return [await _async_replay(QUERY) for _ in range(3)]
+
+    assert asyncio.run(_async_test()) == [{"data": 1}, {"data": 2}, {"data": 1}]
+    assert session.requests == 3
+
+
+def test_replay_raises_recorded_failures():
+    """Recorded failures and unknown queries raise like aiohttp would."""
+    session = ReplaySession(
+        [
+            _record(None, status=None, error={"type": "TimeoutError", "message": ""}),
+            _record(None, query="{ me { firstName } }", status=500),
+        ],
+        speed=0,
+    )
+
+    async def _async_test() -> None:
+        with pytest.raises(asyncio.TimeoutError):
+            await session.post("", data=json.dumps({"query": QUERY}))
+
+        response = await session.post(
+            "", data=json.dumps({"query": "{ me { firstName } }"})
+        )
+        with pytest.raises(aiohttp.ClientResponseError):
+            response.raise_for_status()
+
+        with pytest.raises(aiohttp.ClientError):
+            await session.post("", data=json.dumps({"query": "{ unknown }"}))
+
+    asyncio.run(_async_test())
@@ -0,0 +1,207 @@
+"""Tests for the validation of partial Sutro GraphQL responses."""
+from custom_components.sutro.snapshot import account_pools
+from custom_components.sutro.snapshot import errored_sections
+from custom_components.sutro.snapshot import merge_pools
+from custom_components.sutro.snapshot import SECTIONS
+
+
+def _pool(pool_id, **sections):
+    """Return a pool with every section filled in, unless given."""
+    pool = {
+        "id": pool_id,
+        "device": {"serialNumber": f"SUTRO-{pool_id}", "batteryLevel": 90},
+        "hub": {"online": True},
+        "latestReading": {"ph": 7.4, "readingTime": "2024-01-01T00:00:00+00:00"},
+        "latestRecommendations": {"recommendations": []},
+    }
+    pool.update(sections)
+    return pool
+
+
+def test_errored_sections_of_a_section():
+    """An error inside a section fails only that section."""
+    errors = [{"path": ["me", "pools", 1, "hub", "online"]}]
+
+    assert errored_sections(errors, ["a", "b"]) == {("b", "hub")}
+
+
+def test_errored_sections_of_a_whole_pool():
+    """An error on a pool itself fails all of its sections."""
+    errors = [{"path": ["me", "pools", 0]}]
+
+    assert errored_sections(errors, ["a"]) == {("a", section) for section in SECTIONS}
+
+
+def test_errored_sections_without_a_path():
+    """An error without a path cannot be tied to a pool."""
+    for error in ({}, {"path": None}, {"path": []}, {"path": ["me"]}):
+        assert errored_sections([error], ["a"]) == set()
+
+
+def test_errored_sections_of_unknown_pool_indexes():
+    """An error on a pool index out of range or without id fails nothing."""
+    for index in (2, "0", None):
+        errors = [{"path": ["me", "pools", index, "device"]}]
+        assert errored_sections(errors, ["a", "b"]) == set()
+
+    errors = [{"path": ["me", "pools", 0, "device"]}]
+    assert errored_sections(errors, [None]) == set()
+
+
+def test_merge_pools_keeps_null_sections():
+    """A section that came back null keeps its last good value."""
+    previous = {"a": _pool("a")}
+
+    merged, failed = merge_pools(previous, [_pool("a", hub=None)], None)
+
+    assert merged["a"]["hub"] == {"online": True}
+    assert failed == {("a", "hub")}
+
+
+def test_merge_pools_keeps_errored_sections():
+    """A section with an error keeps its last good value, even if returned."""
+    previous = {"a": _pool("a")}
+    pools = [_pool("a", device={"serialNumber": "SUTRO-a", "batteryLevel": 10})]
+    errors = [{"path": ["me", "pools", 0, "device", "batteryLevel"]}]
+
+    merged, failed = merge_pools(previous, pools, errors)
+
+    assert merged["a"]["device"]["batteryLevel"] == 90
+    assert failed == {("a", "device")}
+
+
+def test_merge_pools_lays_partial_sections_over_previous():
+    """Only the expected sections are taken from a partial result."""
+    previous = {"a": _pool("a")}
+    pools = [
+        {
+            "id": "a",
+            "device": {"serialNumber": "SUTRO-a", "online": False},
+            "hub": {"online": False},
+        }
+    ]
+
+    merged, failed = merge_pools(previous, pools, None, ("device", "hub"))
+
+    assert merged["a"]["device"] == {
+        "serialNumber": "SUTRO-a",
+        "batteryLevel": 90,
+        "online": False,
+    }
+    assert merged["a"]["hub"] == {"online": False}
+    assert merged["a"]["latestReading"] == previous["a"]["latestReading"]
+    assert not failed
+
+
+def test_merge_pools_without_previous_data():
+    """A first result with a null section leaves it null."""
+    merged, failed = merge_pools(None, [_pool("a", hub=None)], None)
+
+    assert merged["a"]["hub"] is None
+    assert failed == {("a", "hub")}
+
+
+def test_merge_pools_keeps_missing_pools():
+    """A pool left out of a result is kept, with its sections failed."""
+    previous = {"a": _pool("a"), "b": _pool("b")}
+
+    merged, failed = merge_pools(previous, [_pool("a")], None)
+
+    assert merged["b"] == previous["b"]
+    assert failed == {("b", section) for section in SECTIONS}
+
+
+def test_merge_pools_with_an_empty_pool_list():
+    """A result without pools keeps every pool as it was."""
+    previous = {"a": _pool("a")}
+
+    merged, failed = merge_pools(previous, [], None)
+
+    assert merged == previous
+    assert failed == {("a", section) for section in SECTIONS}
+
+
+def test_merge_pools_with_an_unknown_pool_index():
+    """An error on an unknown pool index does not fail the known pools."""
+    previous = {"a": _pool("a")}
+    errors = [{"path": ["me", "pools", 5]}]
+
+    merged, failed = merge_pools(previous, [_pool("a")], errors)
+
+    assert merged == previous
+    assert not failed
+
+
+def test_merge_pools_with_an_error_without_a_path():
+    """An error without a path only fails the sections it left null."""
+    previous = {"a": _pool("a")}
+
+    merged, failed = merge_pools(
+        previous, [_pool("a", latestReading=None)], [{"message": "x"}]
+    )
+
+    assert merged["a"]["latestReading"] == previous["a"]["latestReading"]
+    assert failed == {("a", "latestReading")}
+
+
+def test_merge_pools_with_a_null_pool():
+    """A null pool in the result is skipped."""
+    previous = {"a": _pool("a")}
+
+    merged, failed = merge_pools(previous, [None], None)
+
+    assert merged == previous
+    assert failed == {("a", section) for section in SECTIONS}
+
+
+def test_account_pools():
+    """The device, hub and pool of an account make up one pool."""
+    me = {
+        "id": "user-1",
+        "device": {"serialNumber": "SUTRO1"},
+        "hub": None,
+        "pool": {"type": "spa", "latestReading": {"ph": 7.2}},
+    }
+
+    pools, errors = account_pools(me, None)
+
+    assert pools == [
+        {
+            "id": "user-1",
+            "type": "spa",
+            "device": {"serialNumber": "SUTRO1"},
+            "hub": None,
+            "latestReading": {"ph": 7.2},
+            "latestRecommendations": None,
+        }
+    ]
+    assert errors == []
+
+
+def test_account_pools_rewrites_error_paths():
+    """Errors under ``me`` point into the pool they belong to."""
+    errors = [
+        {"path": ["me", "device", "batteryLevel"]},
+        {"path": ["me", "pool", "latestReading", "ph"]},
+        {"path": ["me", "pool"]},
+        {"path": ["me", "firstName"]},
+        {"message": "no path"},
+    ]
+
+    _, rewritten = account_pools({"id": "user-1", "pool": None}, errors)
+
+    assert [error.get("path") for error in rewritten] == [
+        ["me", "pools", 0, "device", "batteryLevel"],
+        ["me", "pools", 0, "latestReading", "ph"],
+        ["me", "pools", 0, "latestReading"],
+        ["me", "pools", 0, "latestRecommendations"],
+        ["me", "firstName"],
+        None,
+    ]
+
+
+def test_account_pools_without_an_account_id():
+    """An account without id has no pool that could be told apart."""
+    pools, _ = account_pools({"id": None, "device": {}}, None)
+
+    assert pools == []